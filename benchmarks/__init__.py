@@ -0,0 +1 @@
+# Benchmarks - Medições reproduzíveis dos caminhos críticos
@@ -0,0 +1,55 @@
+import argparse
+import sys
+from benchmarks import bench_core, bench_screens  # noqa: F401 - registra os benchmarks
+from benchmarks.harness import compare, format_time, load, run, save, select
+
+
+def _report(name: str, result: dict):
+    print(f'{name:<36} {format_time(result["median"]):>12} {format_time(result["stdev"]):>12}  (n={result["number"]})')
+
+
+def _print_comparison(rows, threshold: float) -> int:
+    regressions = 0
+    print(f'\n{"benchmark":<36} {"base":>12} {"atual":>12} {"razão":>8}')
+    for row in rows:
+        flag = '  REGRESSÃO' if row['regression'] else ''
+        regressions += row['regression']
+        print(f'{row["name"]:<36} {format_time(row["baseline"]):>12} {format_time(row["current"]):>12} {row["ratio"]:>7.2f}x{flag}')
+    print(f'\n{regressions} regressão(ões) acima de {threshold:.0%}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks do núcleo e das telas.')
+    parser.add_argument('names', nargs='*', help='filtra benchmarks cujo nome contém o texto')
+    parser.add_argument('--group', choices=('core', 'screen'), help='roda só um grupo')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplica o número de operações')
+    parser.add_argument('--output', '-o', help='grava os resultados em JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON de linha de base para comparar')
+    parser.add_argument('--threshold', type=float, default=0.10, help='piora relativa tolerada (padrão 10%%)')
+    parser.add_argument('--list', action='store_true', help='lista os benchmarks e sai')
+    args = parser.parse_args()
+    
+    selected = select(args.names, args.group)
+    if args.list:
+        for bench in selected:
+            print(f'{bench.group:<8} {bench.name}')
+        return
+    
+    print(f'{"benchmark":<36} {"mediana":>12} {"desvio":>12}')
+    core = [bench for bench in selected if bench.group != 'screen']
+    screens = [bench for bench in selected if bench.group == 'screen']
+    results = run(core, args.scale, _report)
+    if screens:
+        results.update(bench_screens.run_in_app(lambda: run(screens, args.scale, _report)) or {})
+    
+    if args.output:
+        save(args.output, results)
+    
+    if args.compare:
+        if _print_comparison(compare(results, load(args.compare), args.threshold), args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
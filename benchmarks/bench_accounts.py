@@ -0,0 +1,53 @@
+import argparse
+import sys
+import threading
+import time
+from game.core.accounts import AccountStore
+
+
+def run_workers(store: AccountStore, workers: int, operations: int, players_per_worker: int = 100) -> float:
+    """Executa reserve/commit em paralelo e devolve operações por segundo."""
+    barrier = threading.Barrier(workers + 1)
+    
+    def worker(worker_id: int):
+        players = [f'w{worker_id}-p{i}' for i in range(players_per_worker)]
+        for player in players:
+            store.open(player, 1e12)
+        barrier.wait()
+        for i in range(operations):
+            player = players[i % players_per_worker]
+            store.reserve(player, 1.0)
+            store.commit(player, 1.0, 2.0 if i & 1 else 0.0)
+    
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return workers * operations * 2 / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Contenção do AccountStore por número de workers.')
+    parser.add_argument('--operations', type=int, default=100_000, help='apostas por worker')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--shards', type=int, default=64)
+    args = parser.parse_args()
+    
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {sys.version.split()[0]} (GIL {"ativo" if gil else "desativado"})')
+    print(f'{"workers":>8} {"1 trava (ops/s)":>18} {f"{args.shards} shards (ops/s)":>20} {"escala":>8}')
+    
+    baseline = None
+    for workers in args.workers:
+        single = run_workers(AccountStore(shards=1), workers, args.operations)
+        sharded = run_workers(AccountStore(shards=args.shards), workers, args.operations)
+        baseline = baseline or sharded
+        print(f'{workers:>8} {single:>18,.0f} {sharded:>20,.0f} {sharded / baseline:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
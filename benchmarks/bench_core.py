@@ -0,0 +1,107 @@
+import random
+from game.core.accounts import AccountStore
+from game.core.clock import VirtualClock
+from game.games.crash import BETTING_DURATION, CrashGame
+from benchmarks.harness import benchmark, time_calls
+
+
+def betting_game(seed: int = 1) -> CrashGame:
+    game = CrashGame(clock=VirtualClock(), rng=random.Random(seed))
+    game.start_new_round()
+    return game
+
+
+def flying_game(bets: int, seed: int = 1) -> CrashGame:
+    """Jogo em voo com ``bets`` apostas abertas e um crash distante."""
+    game = betting_game(seed)
+    rng = random.Random(seed)
+    for _ in range(bets):
+        game.add_bet(10.0, rng.uniform(500.0, 900.0) if rng.random() < 0.5 else None)
+    game.crash_multiplier = 1000.0
+    game.clock.advance(BETTING_DURATION)
+    game.advance()
+    return game
+
+
+def _bench_update(bets: int):
+    def run(number: int) -> float:
+        game = flying_game(bets)
+        clock = game.clock
+        
+        def step():
+            clock.advance(0.001)
+            game.update(0.001)
+        return time_calls(step, number)
+    return run
+
+
+for _bets, _number in ((10, 20_000), (1_000, 20_000), (100_000, 20_000)):
+    benchmark(f'crash.update[{_bets}]', number=_number)(_bench_update(_bets))
+
+
+@benchmark('crash.add_bet', number=10_000)
+def bench_add_bet(number: int) -> float:
+    game = betting_game()
+    return time_calls(lambda: game.add_bet(10.0, 2.0), number)
+
+
+@benchmark('crash.add_bets[100]', number=10_000)
+def bench_add_bets(number: int) -> float:
+    """Tempo por aposta, em lotes de 100."""
+    game = betting_game()
+    batch = [(10.0, 2.0)] * 100
+    batches = max(1, number // len(batch))
+    return time_calls(lambda: game.add_bets(batch), batches) * number / (batches * len(batch))
+
+
+def _bench_cashout_all(bets: int):
+    def run(number: int) -> float:
+        elapsed = 0.0
+        for _ in range(number):
+            game = flying_game(bets)
+            game.clock.advance(0.5)
+            elapsed += time_calls(game.cashout_all, 1)
+        return elapsed
+    return run
+
+
+benchmark('crash.cashout_all[1000]', number=20)(_bench_cashout_all(1_000))
+benchmark('crash.cashout_all[100000]', number=2, repeat=3)(_bench_cashout_all(100_000))
+
+
+@benchmark('liability.build[100000]', number=3, repeat=3)
+def bench_liability_build(number: int) -> float:
+    game = flying_game(100_000)
+    return time_calls(lambda: game.liability.build(game.active_bets), number)
+
+
+@benchmark('liability.worst_case_at[100000]', number=100_000)
+def bench_liability_query(number: int) -> float:
+    liability = flying_game(100_000).liability
+    rng = random.Random(1)
+    points = [rng.uniform(1.0, 1000.0) for _ in range(1024)]
+    queries = iter(points * (number // len(points) + 1))
+    return time_calls(lambda: liability.worst_case_at(next(queries)), number)
+
+
+@benchmark('crash.generate_crash_point', number=200_000)
+def bench_generate_crash_point(number: int) -> float:
+    game = CrashGame(rng=random.Random(1))
+    return time_calls(game._generate_crash_point, number)
+
+
+@benchmark('crash.get_game_state', number=200_000)
+def bench_get_game_state(number: int) -> float:
+    game = flying_game(10)
+    return time_calls(game.get_game_state, number)
+
+
+@benchmark('accounts.reserve_commit', number=100_000)
+def bench_reserve_commit(number: int) -> float:
+    store = AccountStore()
+    store.open('bench', 1e12)
+    
+    def bet():
+        store.reserve('bench', 1.0)
+        store.commit('bench', 1.0, 2.0)
+    return time_calls(bet, number)
@@ -0,0 +1,105 @@
+import os
+import random
+from game.core.clock import VirtualClock
+from game.core.game_manager import GameManager
+from game.games.crash import BETTING_DURATION, CrashGame
+from benchmarks.harness import benchmark, time_calls
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KV_FILES = ['layouts/games/crash_game_area.kv', 'layouts/base_game.kv']
+
+
+def _screen_for(table: str, bets: int, flying: bool):
+    """Cria uma CrashGameScreen sobre uma mesa própria com relógio virtual."""
+    from screens.crash_game_screen import CrashGameScreen
+    
+    game = CrashGame(auto_restart=True, rng=random.Random(1))
+    game_manager = GameManager()
+    game_manager.register_game(table, game)
+    game.clock = VirtualClock(game_manager.engine.clock.now())
+    game.start_new_round()
+    
+    rng = random.Random(1)
+    for _ in range(bets):
+        game.add_bet(10.0, rng.uniform(500.0, 900.0) if rng.random() < 0.5 else None)
+    
+    if flying:
+        game.crash_multiplier = 1000.0
+        game.clock.advance(BETTING_DURATION)
+        game.advance()
+    return CrashGameScreen(name=table, table=table)
+
+
+def _bench_update_loop(bets: int):
+    def run(number: int) -> float:
+        screen = _screen_for(f'bench-loop-{bets}', bets, flying=True)
+        clock = screen.game.clock
+        
+        def frame():
+            clock.advance(1 / 60)
+            screen.update_loop(1 / 60)
+        return time_calls(frame, number)
+    return run
+
+
+def _bench_update_bets_display(bets: int):
+    def run(number: int) -> float:
+        screen = _screen_for(f'bench-bets-{bets}', bets, flying=False)
+        return time_calls(screen.update_bets_display, number)
+    return run
+
+
+@benchmark('screen.add_bet', group='screen', number=200)
+def bench_screen_add_bet(number: int) -> float:
+    screen = _screen_for('bench-add-bet', 0, flying=False)
+    screen.game_manager.add_balance(number * 10.0)
+    screen.bet_amount = 10
+    return time_calls(screen.add_bet, number)
+
+
+@benchmark('screen.add_bets[100]', group='screen', number=2_000)
+def bench_screen_add_bets(number: int) -> float:
+    """Tempo por aposta, em lotes de 100."""
+    screen = _screen_for('bench-add-bets', 0, flying=False)
+    screen.game_manager.add_balance(number * 10.0)
+    batch = [(10.0, 2.0)] * 100
+    batches = max(1, number // len(batch))
+    return time_calls(lambda: screen.add_bets(batch), batches) * number / (batches * len(batch))
+
+
+for _bets in (10, 1_000):
+    benchmark(f'screen.update_loop[{_bets}]', group='screen', number=600)(_bench_update_loop(_bets))
+    benchmark(f'screen.update_bets_display[{_bets}]', group='screen', number=200)(_bench_update_bets_display(_bets))
+
+
+def run_in_app(callback):
+    """Roda ``callback()`` dentro de um MDApp (necessário para os widgets do KivyMD)."""
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.chdir(ROOT)
+    from kivy.clock import Clock
+    from kivy.lang import Builder
+    from kivy.uix.widget import Widget
+    from kivymd.app import MDApp
+    
+    outcome = {}
+    
+    class BenchmarkApp(MDApp):
+        
+        def build(self):
+            self.theme_cls.theme_style = "Dark"
+            for path in KV_FILES:
+                Builder.load_file(path)
+            return Widget()
+        
+        def on_start(self):
+            Clock.schedule_once(self._run, 0)
+        
+        def _run(self, dt):
+            try:
+                outcome['result'] = callback()
+            finally:
+                self.stop()
+    
+    BenchmarkApp().run()
+    return outcome.get('result')
@@ -0,0 +1,119 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class Benchmark:
+    __slots__ = ('name', 'func', 'group', 'number', 'repeat')
+    
+    def __init__(self, name: str, func: Callable[[int], float], group: str, number: int, repeat: int):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.number = number
+        self.repeat = repeat
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str = 'core', number: int = 1000, repeat: int = 5):
+    """Registra uma função ``func(number) -> segundos`` que mede ``number`` operações.
+    
+    A função faz o próprio preparo e só cronometra o trecho medido, para que
+    montar o estado (milhares de apostas, uma tela) não entre no resultado.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = Benchmark(name, func, group, number, repeat)
+        return func
+    return decorator
+
+
+def time_calls(func: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def select(names: Optional[List[str]] = None, group: Optional[str] = None) -> List[Benchmark]:
+    selected = []
+    for bench in BENCHMARKS.values():
+        if group and bench.group != group:
+            continue
+        if names and not any(name in bench.name for name in names):
+            continue
+        selected.append(bench)
+    return selected
+
+
+def run_benchmark(bench: Benchmark, scale: float = 1.0) -> dict:
+    number = max(1, int(bench.number * scale))
+    samples = [bench.func(number) / number for _ in range(bench.repeat)]
+    return {
+        'group': bench.group,
+        'number': number,
+        'repeat': bench.repeat,
+        'unit': 's/op',
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run(benchmarks: List[Benchmark], scale: float = 1.0, report: Optional[Callable[[str, dict], None]] = None) -> Dict[str, dict]:
+    results = {}
+    for bench in benchmarks:
+        results[bench.name] = run_benchmark(bench, scale)
+        if report:
+            report(bench.name, results[bench.name])
+    return results
+
+
+def metadata() -> dict:
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save(path: str, results: Dict[str, dict]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float = 0.10) -> List[dict]:
+    """Compara medianas; ``ratio`` > 1 significa mais lento que a linha de base."""
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None or base['median'] <= 0:
+            continue
+        ratio = result['median'] / base['median']
+        rows.append({
+            'name': name,
+            'baseline': base['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, factor in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= factor:
+            return f'{seconds / factor:.3f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from game.core.accounts import AccountStore
+from game.core.clock import VirtualClock
+from game.core.profiler import LatencyHistogram
+from game.games.crash import CrashGame, GameState
+
+
+BET_PROBABILITY = 0.8
+AUTO_CASHOUT_SHARE = 0.6
+MIN_STAKE = 1.0
+MAX_STAKE = 50.0
+STARTING_BALANCE = 1e9
+
+
+class Bettor:
+    """Comportamento de um jogador sintético, sorteado a partir do RNG do worker."""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    @staticmethod
+    def decide(rng: random.Random):
+        """Devolve ``None`` (não aposta) ou ``(valor, auto_cashout, saque_manual)``."""
+        if rng.random() > BET_PROBABILITY:
+            return None
+        stake = round(rng.uniform(MIN_STAKE, MAX_STAKE), 2)
+        target = round(1.01 + rng.expovariate(1.0), 2)
+        if rng.random() < AUTO_CASHOUT_SHARE:
+            return stake, target, None
+        return stake, None, target
+
+
+def _histograms():
+    return {'bet': LatencyHistogram(), 'cashout': LatencyHistogram(), 'auto_settle': LatencyHistogram()}
+
+
+def run_core_worker(worker_id: int, players: int, rounds: int, seed: int) -> dict:
+    """Joga ``rounds`` rodadas com relógio virtual numa mesa própria do processo."""
+    rng = random.Random(f'{seed}-{worker_id}')
+    game = CrashGame(clock=VirtualClock(), rng=random.Random(rng.getrandbits(64)))
+    accounts = AccountStore()
+    bettors = [Bettor(f'w{worker_id}-p{i}') for i in range(players)]
+    for bettor in bettors:
+        accounts.open(bettor.name, STARTING_BALANCE)
+    
+    latency = _histograms()
+    perf_counter = time.perf_counter
+    placed = 0
+    cpu_started = time.process_time()
+    started = perf_counter()
+    
+    for _ in range(rounds):
+        game.start_new_round()
+        exits = []
+        for bettor in bettors:
+            decision = Bettor.decide(rng)
+            if decision is None:
+                continue
+            stake, auto_cashout, manual_exit = decision
+            
+            begin = perf_counter()
+            accepted = accounts.reserve(bettor.name, stake) and game.add_bet(stake, auto_cashout, player=bettor.name)
+            latency['bet'].record(perf_counter() - begin)
+            if accepted:
+                placed += 1
+                if manual_exit:
+                    exits.append((manual_exit, bettor.name))
+        exits.sort(reverse=True)
+        
+        while game.state == GameState.BETTING:
+            game.clock.advance_to(game.next_deadline())
+            game.advance()
+        
+        while game.state == GameState.FLYING:
+            deadline = game.next_deadline()
+            if exits and game.time_at_multiplier(exits[-1][0]) < deadline:
+                manual_exit, player = exits.pop()
+                game.clock.advance_to(game.time_at_multiplier(manual_exit))
+                begin = perf_counter()
+                game.cashout_all(player=player)
+                latency['cashout'].record(perf_counter() - begin)
+            else:
+                game.clock.advance_to(deadline)
+                begin = perf_counter()
+                game.advance()
+                latency['auto_settle'].record(perf_counter() - begin)
+        
+        for bet in game.active_bets:
+            payout = bet.amount * bet.cashout_multiplier if bet.cashed_out else 0.0
+            accounts.commit(bet.player, bet.amount, payout)
+    
+    return {
+        'players': players,
+        'rounds': rounds,
+        'bets': placed,
+        'wall': perf_counter() - started,
+        'cpu': time.process_time() - cpu_started,
+        'latency': latency,
+        'checksum': round(sum(account.balance for account in accounts), 2),
+    }
+
+
+def run_server_worker(worker_id: int, players: int, rounds: int, seed: int, host: str, port: int) -> dict:
+    return asyncio.run(_server_worker(worker_id, players, rounds, seed, host, port))
+
+
+async def _server_worker(worker_id: int, players: int, rounds: int, seed: int, host: str, port: int) -> dict:
+    from game.net.client import CrashClient
+    
+    rng = random.Random(f'{seed}-{worker_id}')
+    clients = [CrashClient(host, port) for _ in range(players)]
+    await asyncio.gather(*(client.connect() for client in clients))
+    
+    latency = _histograms()
+    perf_counter = time.perf_counter
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    exits = {}
+    counters = {'bets': 0, 'rounds': 0, 'crashes': 0, 'betting_seen': False}
+    tasks = set()
+    
+    async def timed(histogram, request):
+        begin = perf_counter()
+        reply = await request
+        histogram.record(perf_counter() - begin)
+        return reply
+    
+    async def place(client, stake, auto_cashout):
+        reply = await timed(latency['bet'], client.bet(stake, auto_cashout))
+        if reply['type'] == 'bet_ok':
+            counters['bets'] += 1
+    
+    async def cash_out(client, delay, flight):
+        await asyncio.sleep(max(0.0, delay))
+        if counters['crashes'] != flight:
+            return  # o alvo manual ficou acima do ponto de crash
+        await timed(latency['cashout'], client.cashout())
+    
+    def spawn(coroutine):
+        task = loop.create_task(coroutine)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    def on_message(message):
+        kind = message['type']
+        if kind == 'round' and message['state'] == GameState.BETTING:
+            counters['betting_seen'] = True
+            exits.clear()
+            for client in clients:
+                decision = Bettor.decide(rng)
+                if decision is None:
+                    continue
+                stake, auto_cashout, manual_exit = decision
+                spawn(place(client, stake, auto_cashout))
+                if manual_exit:
+                    exits[client] = manual_exit
+        elif kind == 'round' and message['state'] == GameState.FLYING:
+            for client, manual_exit in exits.items():
+                delay = (manual_exit - message['base']) / message['growth'] - message['elapsed']
+                spawn(cash_out(client, delay, counters['crashes']))
+        elif kind == 'crash':
+            counters['crashes'] += 1
+            if not counters['betting_seen']:
+                return
+            counters['rounds'] += 1
+            if counters['rounds'] >= rounds and not finished.done():
+                finished.set_result(None)
+    
+    clients[0].on_message = on_message
+    cpu_started = time.process_time()
+    started = perf_counter()
+    await finished
+    wall = perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    
+    for task in list(tasks):
+        task.cancel()
+    await asyncio.gather(*(client.close() for client in clients))
+    return {
+        'players': players,
+        'rounds': counters['rounds'],
+        'bets': counters['bets'],
+        'wall': wall,
+        'cpu': cpu,
+        'latency': latency,
+        'checksum': None,
+    }
+
+
+def _serve(port: int, seed: int, ready, stop, results):
+    """Processo do servidor local iniciado pelo gerador; devolve o próprio uso de CPU."""
+    from game.net.server import CrashServer
+    
+    async def serve():
+        # Crash points da semente: com a mesma semente a mesa sorteia a mesma sequência
+        server = CrashServer(CrashGame(auto_restart=True, rng=random.Random(f'{seed}-server')), port=port)
+        await server.start()
+        results.put(server.port)
+        ready.set()
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        await server.stop()
+    
+    asyncio.run(serve())
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    results.put(usage.ru_utime + usage.ru_stime)
+
+
+def run(players: int, workers: int, rounds: int, seed: int, server: Optional[str] = None) -> dict:
+    shares = [players // workers + (1 if i < players % workers else 0) for i in range(workers)]
+    server_process = None
+    
+    if server == 'spawn':
+        ready, stop, results = multiprocessing.Event(), multiprocessing.Event(), multiprocessing.Queue()
+        server_process = multiprocessing.Process(target=_serve, args=(0, seed, ready, stop, results))
+        server_process.start()
+        ready.wait()
+        host, port = '127.0.0.1', results.get()
+    elif server:
+        host, _, port = server.rpartition(':')
+        host, port = host or '127.0.0.1', int(port)
+    
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if server:
+            futures = [pool.submit(run_server_worker, i, n, rounds, seed, host, port) for i, n in enumerate(shares)]
+        else:
+            futures = [pool.submit(run_core_worker, i, n, rounds, seed) for i, n in enumerate(shares)]
+        outcomes = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+    
+    server_cpu = None
+    if server_process is not None:
+        stop.set()
+        server_cpu = results.get()
+        server_process.join()
+    
+    return _report(outcomes, players, workers, rounds, seed, wall, 'server' if server else 'core', server_cpu)
+
+
+def _report(outcomes, players, workers, rounds, seed, wall, mode, server_cpu) -> dict:
+    latency = _histograms()
+    for outcome in outcomes:
+        for name, histogram in outcome['latency'].items():
+            latency[name].merge(histogram)
+    
+    bets = sum(outcome['bets'] for outcome in outcomes)
+    worker_wall = max(outcome['wall'] for outcome in outcomes)
+    cpu = sum(outcome['cpu'] for outcome in outcomes)
+    thousands = players / 1000
+    report = {
+        'mode': mode,
+        'seed': seed,
+        'players': players,
+        'workers': workers,
+        'rounds': rounds,
+        'wall': wall,
+        'bets': bets,
+        'bets_per_second': bets / worker_wall if worker_wall else 0.0,
+        'latency': {name: {'count': h.count, 'p50': h.quantile(0.5), 'p90': h.quantile(0.9), 'p99': h.quantile(0.99)}
+                    for name, h in latency.items()},
+        'cpu_seconds': cpu,
+        'cpu_per_1k_players_per_round': cpu / thousands / rounds if players and rounds else 0.0,
+        'checksum': None if mode == 'server' else round(sum(outcome['checksum'] for outcome in outcomes), 2),
+    }
+    if server_cpu is not None:
+        report['server_cpu_seconds'] = server_cpu
+        report['server_cores_per_1k_players'] = server_cpu / worker_wall / thousands
+    return report
+
+
+def _print_report(report: dict):
+    print(f'Modo {report["mode"]}: {report["players"]} jogadores em {report["workers"]} processos, '
+          f'{report["rounds"]} rodadas, semente {report["seed"]}')
+    print(f'Apostas: {report["bets"]} ({report["bets_per_second"]:,.0f}/s) em {report["wall"]:.2f}s')
+    for name, stats in report['latency'].items():
+        if stats['count']:
+            print(f'  {name:<12} p50 {stats["p50"] * 1e6:>9.1f} us  p90 {stats["p90"] * 1e6:>9.1f} us  '
+                  f'p99 {stats["p99"] * 1e6:>9.1f} us  (n={stats["count"]})')
+    print(f'CPU dos workers: {report["cpu_seconds"]:.2f}s '
+          f'({report["cpu_per_1k_players_per_round"] * 1000:.2f} ms por rodada a cada 1k jogadores)')
+    if 'server_cpu_seconds' in report:
+        print(f'CPU do servidor: {report["server_cpu_seconds"]:.2f}s '
+              f'({report["server_cores_per_1k_players"]:.1%} de um núcleo a cada 1k jogadores)')
+    if report['checksum'] is not None:
+        print(f'Checksum dos saldos: {report["checksum"]:.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerador de carga com jogadores sintéticos.')
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--server', help="HOST:PORT de um servidor local, ou 'spawn' para iniciar um "
+                                         "(padrão: núcleo do jogo em processo, com relógio virtual)")
+    parser.add_argument('--output', '-o', help='grava o relatório em JSON')
+    args = parser.parse_args()
+    
+    workers = max(1, min(args.workers, args.players))
+    report = run(args.players, workers, args.rounds, args.seed, args.server)
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
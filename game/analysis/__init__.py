@@ -0,0 +1 @@
+# Analysis package - Ferramentas estatísticas e simulações vetorizadas
@@ -0,0 +1,270 @@
+import argparse
+import math
+import time
+from typing import Dict, Sequence
+import numpy as np
+from game.analysis.crash_points import generate_crash_points
+
+
+MAX_STAKE_MULTIPLE = 1e12
+
+OUTCOME_END = 0
+OUTCOME_RUIN = 1
+OUTCOME_STOP_LOSS = 2
+OUTCOME_TAKE_PROFIT = 3
+
+_GROUP_KEYS = ('target', 'martingale', 'max_steps')
+
+
+def make_grid(targets: Sequence[float], stakes: Sequence[float] = (1.0,), martingale: Sequence[float] = (1.0,),
+              max_steps: Sequence[float] = (math.inf,), stop_loss: Sequence[float] = (math.inf,),
+              take_profit: Sequence[float] = (math.inf,), balance: Sequence[float] = (1000.0,)) -> Dict[str, np.ndarray]:
+    """Produto cartesiano dos parâmetros, uma coluna por parâmetro.
+    
+    ``martingale`` multiplica a aposta a cada derrota (1.0 = aposta fixa) e volta
+    à aposta base na vitória ou depois de ``max_steps`` aumentos seguidos.
+    ``stop_loss`` e ``take_profit`` são perdas/ganhos absolutos sobre o saldo
+    inicial; ``inf`` desliga cada um.
+    """
+    columns = dict(target=targets, stake=stakes, martingale=martingale, max_steps=max_steps,
+                   stop_loss=stop_loss, take_profit=take_profit, balance=balance)
+    mesh = np.meshgrid(*(np.asarray(values, dtype=np.float64) for values in columns.values()), indexing='ij')
+    return {name: values.ravel() for name, values in zip(columns, mesh)}
+
+
+def _sessions(points, session_length=None) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 2:
+        return points
+    if session_length:
+        sessions = len(points) // session_length
+        return points[:sessions * session_length].reshape(sessions, session_length)
+    return points.reshape(1, -1)
+
+
+def _stake_multiples(wins: np.ndarray, factors: np.ndarray, max_steps: np.ndarray) -> np.ndarray:
+    """Multiplicador da aposta base em cada rodada, pela sequência de derrotas anterior."""
+    rounds = wins.shape[-1]
+    positions = np.arange(rounds)
+    last_win = np.maximum.accumulate(np.where(wins, positions, -1), axis=-1)
+    streak = np.empty(wins.shape, dtype=np.float64)
+    streak[..., 0] = 0
+    np.subtract(positions[1:] - 1, last_win[..., :-1], out=streak[..., 1:])
+    
+    steps = max_steps[:, None, None]
+    np.copyto(streak, np.fmod(streak, steps + 1), where=np.isfinite(steps))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent_cap = np.where(factors > 1.0, np.floor(np.log(MAX_STAKE_MULTIPLE) / np.log(factors)), np.inf)
+    np.minimum(streak, exponent_cap[:, None, None], out=streak)
+    return np.power(factors[:, None, None], streak, out=streak)
+
+
+def _group_paths(points: np.ndarray, targets: np.ndarray, factors: np.ndarray, max_steps: np.ndarray):
+    """Lucro acumulado por unidade de aposta base, para cada grupo e sessão.
+    
+    Com alvo, fator e limite do martingale fixos, o resultado de cada rodada é
+    proporcional à aposta base: um único ``cumsum`` serve a todas as apostas,
+    saldos e stops do grupo.
+    """
+    wins = points[None] >= targets[:, None, None]
+    returns = np.where(wins, (targets - 1.0)[:, None, None], -1.0)
+    
+    multiples = np.ones_like(returns)
+    martingale = (factors != 1.0) & (max_steps != 0)
+    if martingale.any():
+        multiples[martingale] = _stake_multiples(wins[martingale], factors[martingale], max_steps[martingale])
+    
+    returns *= multiples
+    profit = np.cumsum(returns, axis=-1)
+    return profit, multiples
+
+
+def _first_passages(profit: np.ndarray, multiples: np.ndarray):
+    """Séries monótonas para achar, via ``searchsorted``, a primeira rodada de cada stop."""
+    previous = np.zeros_like(profit)
+    previous[..., 1:] = profit[..., :-1]
+    
+    # Ruína: saldo antes da rodada não cobre a aposta, isto é previous - multiple < -saldo/base
+    ruin = np.negative(np.minimum.accumulate(previous - multiples, axis=-1))
+    loss = np.negative(np.minimum.accumulate(profit, axis=-1))
+    peak = np.maximum.accumulate(profit, axis=-1)
+    
+    drawdown = np.zeros(profit.shape[:-1] + (profit.shape[-1] + 1,))
+    np.maximum.accumulate(np.maximum(peak, 0.0) - profit, axis=-1, out=drawdown[..., 1:])
+    closing = np.zeros_like(drawdown)
+    closing[..., 1:] = profit
+    return ruin, loss, peak, drawdown, closing
+
+
+def _search(rows: np.ndarray, limits: np.ndarray, side: str) -> np.ndarray:
+    """``searchsorted`` de cada limite em cada linha monótona, de uma vez: (limites, linhas)."""
+    sessions, length = rows.shape
+    if sessions == 1:
+        return np.searchsorted(rows[0], limits, side=side)[:, None]
+    
+    session_index = np.arange(sessions)
+    limits = limits[:, None]
+    low = np.zeros((len(limits), sessions), dtype=np.intp)
+    high = np.full_like(low, length)
+    while True:
+        active = low < high
+        if not active.any():
+            return low
+        middle = (low + high) // 2
+        values = rows[session_index, np.minimum(middle, length - 1)]
+        right = values <= limits if side == 'right' else values < limits
+        low = np.where(active & right, middle + 1, low)
+        high = np.where(active & ~right, middle, high)
+
+
+def _stops(ruin, loss, peak, stake, balance, stop_loss, take_profit):
+    """Última rodada jogada e o motivo da parada, por estratégia e sessão."""
+    rounds = ruin.shape[-1]
+    ruined_at = _search(ruin, balance / stake, 'right')
+    stopped_at = _search(loss, stop_loss / stake, 'left')
+    took_at = _search(peak, take_profit / stake, 'left')
+    last = np.minimum(np.minimum(ruined_at - 1, stopped_at), np.minimum(took_at, rounds - 1))
+    
+    # Um stop na rodada anterior à ruína vence: o jogador parou antes de ficar sem saldo
+    outcome = np.full(last.shape, OUTCOME_END, dtype=np.int8)
+    outcome[(ruined_at - 1 == last) & (ruined_at < rounds)] = OUTCOME_RUIN
+    outcome[(took_at == last) & (took_at < rounds)] = OUTCOME_TAKE_PROFIT
+    outcome[(stopped_at == last) & (stopped_at < rounds)] = OUTCOME_STOP_LOSS
+    return last, outcome
+
+
+def backtest(points, grid: Dict[str, np.ndarray], session_length=None, max_elements: int = 1 << 21) -> dict:
+    """Avalia todas as estratégias de ``grid`` sobre a sequência de crash points.
+    
+    ``points`` pode ser uma sequência gravada ou gerada; com ``session_length``
+    ela é cortada em sessões independentes, e as probabilidades (ruína, stop
+    loss, take profit) são frações das sessões. Uma sessão termina na ruína
+    (saldo não cobre a próxima aposta), num stop ou no fim da sequência.
+    """
+    sessions = _sessions(points, session_length)
+    session_count, rounds = sessions.shape
+    strategies = len(grid['target'])
+    
+    final_balance = np.zeros(strategies)
+    mean_drawdown = np.zeros(strategies)
+    max_drawdown = np.zeros(strategies)
+    rounds_played = np.zeros(strategies)
+    probabilities = np.zeros((4, strategies))
+    
+    keys = np.stack([grid[key] for key in _GROUP_KEYS], axis=1)
+    groups, members = np.unique(keys, axis=0, return_inverse=True)
+    members = members.ravel()
+    order = np.argsort(members, kind='stable')
+    bounds = np.searchsorted(members[order], np.arange(len(groups) + 1))
+    chunk = max(1, max_elements // (session_count * rounds))
+    session_index = np.arange(session_count)
+    
+    for first in range(0, len(groups), chunk):
+        block = groups[first:first + chunk]
+        profit, multiples = _group_paths(sessions, block[:, 0], block[:, 1], block[:, 2])
+        ruin, loss, peak, drawdown, closing = _first_passages(profit, multiples)
+        del profit, multiples
+        
+        for offset in range(len(block)):
+            selected = order[bounds[first + offset]:bounds[first + offset + 1]]
+            stake = grid['stake'][selected]
+            last, outcome = _stops(ruin[offset], loss[offset], peak[offset], stake, grid['balance'][selected],
+                                   grid['stop_loss'][selected], grid['take_profit'][selected])
+            
+            session_drawdown = stake[:, None] * drawdown[offset, session_index, last + 1]
+            final_balance[selected] = (grid['balance'][selected]
+                                       + stake * closing[offset, session_index, last + 1].mean(axis=1))
+            mean_drawdown[selected] = session_drawdown.mean(axis=1)
+            max_drawdown[selected] = session_drawdown.max(axis=1)
+            rounds_played[selected] = (last + 1).mean(axis=1)
+            for code in (OUTCOME_RUIN, OUTCOME_STOP_LOSS, OUTCOME_TAKE_PROFIT):
+                probabilities[code, selected] = np.count_nonzero(outcome == code, axis=1) / session_count
+    
+    return {
+        'strategies': strategies,
+        'sessions': session_count,
+        'rounds': rounds,
+        'groups': len(groups),
+        'final_balance': final_balance,
+        'mean_drawdown': mean_drawdown,
+        'max_drawdown': max_drawdown,
+        'rounds_played': rounds_played,
+        'ruin_probability': probabilities[OUTCOME_RUIN],
+        'stop_loss_probability': probabilities[OUTCOME_STOP_LOSS],
+        'take_profit_probability': probabilities[OUTCOME_TAKE_PROFIT],
+    }
+
+
+def balance_curve(points, target: float, stake: float = 1.0, martingale: float = 1.0, max_steps: float = math.inf,
+                  stop_loss: float = math.inf, take_profit: float = math.inf, balance: float = 1000.0) -> np.ndarray:
+    """Saldo antes da primeira rodada e depois de cada uma, congelado quando a estratégia para."""
+    path = _sessions(points)[:1]
+    profit, multiples = _group_paths(path, np.array([target]), np.array([martingale]), np.array([max_steps]))
+    ruin, loss, peak, _, closing = _first_passages(profit, multiples)
+    
+    last, _ = _stops(ruin[0], loss[0], peak[0], np.array([stake]), np.array([balance]),
+                     np.array([stop_loss]), np.array([take_profit]))
+    last = int(last[0, 0])
+    
+    curve = balance + stake * closing[0, 0]
+    curve[last + 2:] = curve[last + 1]
+    return curve
+
+
+def drawdown_curve(curve: np.ndarray) -> np.ndarray:
+    return np.maximum.accumulate(curve) - curve
+
+
+def load_history(path: str) -> np.ndarray:
+    if path.endswith('.npy'):
+        return np.load(path)
+    if path.endswith('.db'):
+        from game.core.history_store import HistoryStore
+        store = HistoryStore(path, read_only=True)
+        try:
+            return np.asarray(store.crash_points(), dtype=np.float64)
+        finally:
+            store.close()
+    return np.loadtxt(path, dtype=np.float64, ndmin=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest vetorizado de estratégias de auto-cashout do Crash.')
+    parser.add_argument('--rounds', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--history', help='crash points gravados (.npy, texto com um por linha, ou o banco .db do histórico)')
+    parser.add_argument('--session', type=int, default=None, help='rodadas por sessão (padrão: uma sessão única)')
+    parser.add_argument('--target', type=float, nargs='+', default=[1.5, 2.0, 5.0])
+    parser.add_argument('--stake', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--martingale', type=float, nargs='+', default=[1.0, 2.0])
+    parser.add_argument('--max-steps', type=float, nargs='+', default=[math.inf])
+    parser.add_argument('--stop-loss', type=float, nargs='+', default=[math.inf])
+    parser.add_argument('--take-profit', type=float, nargs='+', default=[math.inf])
+    parser.add_argument('--balance', type=float, nargs='+', default=[1000.0])
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    
+    try:
+        points = load_history(args.history) if args.history else generate_crash_points(args.rounds, args.seed)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    grid = make_grid(args.target, args.stake, args.martingale, args.max_steps,
+                     args.stop_loss, args.take_profit, args.balance)
+    
+    started = time.perf_counter()
+    report = backtest(points, grid, session_length=args.session)
+    elapsed = time.perf_counter() - started
+    
+    print(f"{report['strategies']} estratégias ({report['groups']} grupos) x {report['sessions']} sessões "
+          f"de {report['rounds']} rodadas em {elapsed:.2f}s")
+    ranking = np.lexsort((-report['final_balance'], report['ruin_probability']))
+    for i in ranking[:args.top]:
+        print(f"alvo {grid['target'][i]:.2f}x aposta {grid['stake'][i]:g} martingale {grid['martingale'][i]:g} "
+              f"(máx {grid['max_steps'][i]:g}) stop {grid['stop_loss'][i]:g}/{grid['take_profit'][i]:g} "
+              f"saldo {grid['balance'][i]:g}: final {report['final_balance'][i]:,.2f}, "
+              f"drawdown máx {report['max_drawdown'][i]:,.2f}, ruína {report['ruin_probability'][i]:.2%}, "
+              f"{report['rounds_played'][i]:,.0f} rodadas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import argparse
+import math
+import time
+from statistics import NormalDist
+from typing import Sequence
+import numpy as np
+from game.games.crash import CRASH_BANDS
+
+
+_THRESHOLDS = np.cumsum([probability for probability, _, _ in CRASH_BANDS])
+_LOWS = np.array([low for _, low, _ in CRASH_BANDS])
+_SPANS = np.array([high - low for _, low, high in CRASH_BANDS])
+
+
+def draw_bands(n: int, rng) -> np.ndarray:
+    bands = np.searchsorted(_THRESHOLDS, rng.random(n), side='right')
+    return np.minimum(bands, len(CRASH_BANDS) - 1, out=bands)
+
+
+def generate_crash_points(n: int, rng=None) -> np.ndarray:
+    rng = np.random.default_rng(rng)
+    bands = draw_bands(n, rng)
+    return _LOWS[bands] + _SPANS[bands] * rng.random(n)
+
+
+def theoretical_win_probability(target: float) -> float:
+    probability = 0.0
+    for band_probability, low, high in CRASH_BANDS:
+        if target <= low:
+            probability += band_probability
+        elif target < high:
+            probability += band_probability * (high - target) / (high - low)
+    return probability
+
+
+def theoretical_rtp(target: float) -> float:
+    return target * theoretical_win_probability(target)
+
+
+def estimate_rtp(rounds: int, targets: Sequence[float] = (2.0,), seed=None,
+                 chunk_size: int = 10_000_000, confidence: float = 0.95) -> dict:
+    rng = np.random.default_rng(seed)
+    targets = np.asarray(targets, dtype=np.float64)
+    band_counts = np.zeros(len(CRASH_BANDS), dtype=np.int64)
+    wins = np.zeros(len(targets), dtype=np.int64)
+    point_sum = 0.0
+    point_sq_sum = 0.0
+    
+    remaining = rounds
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        bands = draw_bands(n, rng)
+        points = _LOWS[bands] + _SPANS[bands] * rng.random(n)
+        
+        band_counts += np.bincount(bands, minlength=len(CRASH_BANDS))
+        point_sum += float(points.sum())
+        point_sq_sum += float(np.dot(points, points))
+        
+        if len(targets) > 8:
+            points.sort()
+            wins += n - np.searchsorted(points, targets, side='left')
+        else:
+            for i, target in enumerate(targets):
+                wins[i] += np.count_nonzero(points >= target)
+        remaining -= n
+    
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    
+    def interval(mean, variance):
+        half_width = z * math.sqrt(max(variance, 0.0) / rounds)
+        return (mean - half_width, mean + half_width)
+    
+    bands = []
+    for (probability, low, high), count in zip(CRASH_BANDS, band_counts):
+        frequency = count / rounds
+        bands.append({
+            'low': low,
+            'high': high,
+            'expected': probability,
+            'frequency': frequency,
+            'ci': interval(frequency, frequency * (1 - frequency)),
+        })
+    
+    mean_point = point_sum / rounds
+    payouts = []
+    for target, win_count in zip(targets, wins):
+        target = float(target)
+        win_probability = win_count / rounds
+        rtp = target * win_probability
+        payouts.append({
+            'target': target,
+            'win_probability': win_probability,
+            'rtp': rtp,
+            'rtp_ci': interval(rtp, target * target * win_probability * (1 - win_probability)),
+            'house_edge': 1.0 - rtp,
+            'theoretical_rtp': theoretical_rtp(target),
+        })
+    
+    return {
+        'rounds': rounds,
+        'confidence': confidence,
+        'bands': bands,
+        'mean_crash_point': mean_point,
+        'mean_crash_point_ci': interval(mean_point, point_sq_sum / rounds - mean_point * mean_point),
+        'payouts': payouts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estima RTP e frequências do Crash por Monte Carlo.')
+    parser.add_argument('--rounds', type=int, default=10_000_000)
+    parser.add_argument('--target', type=float, action='append')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=10_000_000)
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    report = estimate_rtp(args.rounds, args.target or [2.0], seed=args.seed, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+    
+    print(f"{report['rounds']} rodadas em {elapsed:.2f}s")
+    for band in report['bands']:
+        low, high = band['ci']
+        print(f"{band['low']:.1f}x - {band['high']:.1f}x: {band['frequency']:.4%} "
+              f"(esperado {band['expected']:.0%}, IC [{low:.4%}, {high:.4%}])")
+    
+    low, high = report['mean_crash_point_ci']
+    print(f"Crash médio: {report['mean_crash_point']:.4f}x (IC [{low:.4f}, {high:.4f}])")
+    for payout in report['payouts']:
+        low, high = payout['rtp_ci']
+        print(f"Auto-cashout {payout['target']:.2f}x: RTP {payout['rtp']:.4%} "
+              f"(IC [{low:.4%}, {high:.4%}], teórico {payout['theoretical_rtp']:.4%}, "
+              f"vantagem da casa {payout['house_edge']:.4%})")
+
+
+if __name__ == '__main__':
+    main()
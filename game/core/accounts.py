@@ -0,0 +1,134 @@
+import threading
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from game.core.ledger import LedgerKind
+
+
+class Account:
+    __slots__ = ('player', 'balance', 'reserved')
+    
+    def __init__(self, player: str, balance: float = 0.0):
+        self.player = player
+        self.balance = balance
+        self.reserved = 0.0
+
+
+class _Shard:
+    __slots__ = ('lock', 'accounts')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.accounts: Dict[str, Account] = {}
+
+
+class AccountStore:
+    """Saldos por jogador com travas particionadas.
+    
+    Cada jogador pertence a um shard fixo (crc32 do id), e cada shard tem
+    sua própria trava: operações de jogadores em shards diferentes nunca
+    disputam a mesma trava. Uma aposta passa por reserve (sai do saldo e
+    fica reservada), e depois commit (liquida com o pagamento) ou refund
+    (devolve o valor).
+    """
+    
+    def __init__(self, shards: int = 64, default_balance: float = 1000.0):
+        self.default_balance = default_balance
+        self.journal: Optional[Callable[[str, str, float, float], None]] = None
+        self._shards: Tuple[_Shard, ...] = tuple(_Shard() for _ in range(shards))
+    
+    def __len__(self) -> int:
+        return sum(len(shard.accounts) for shard in self._shards)
+    
+    def __contains__(self, player: str) -> bool:
+        shard = self._shard(player)
+        with shard.lock:
+            return player in shard.accounts
+    
+    def __iter__(self) -> Iterator[Account]:
+        for shard in self._shards:
+            with shard.lock:
+                accounts: List[Account] = list(shard.accounts.values())
+            yield from accounts
+    
+    def open(self, player: str, balance: Optional[float] = None) -> Account:
+        shard = self._shard(player)
+        with shard.lock:
+            account = shard.accounts.get(player)
+            if account is None:
+                account = Account(player, self.default_balance if balance is None else balance)
+                shard.accounts[player] = account
+            return account
+    
+    def balance(self, player: str) -> float:
+        shard = self._shard(player)
+        with shard.lock:
+            return self._get(shard, player).balance
+    
+    def reserved(self, player: str) -> float:
+        shard = self._shard(player)
+        with shard.lock:
+            return self._get(shard, player).reserved
+    
+    def deposit(self, player: str, amount: float, kind: str = LedgerKind.CREDIT) -> float:
+        shard = self._shard(player)
+        with shard.lock:
+            account = self._get(shard, player)
+            account.balance += amount
+            self._record(player, kind, amount, account.balance)
+            return account.balance
+    
+    def withdraw(self, player: str, amount: float, kind: str = LedgerKind.DEBIT) -> bool:
+        shard = self._shard(player)
+        with shard.lock:
+            account = self._get(shard, player)
+            if amount > account.balance:
+                return False
+            account.balance -= amount
+            self._record(player, kind, amount, account.balance)
+            return True
+    
+    def reserve(self, player: str, amount: float, kind: str = LedgerKind.BET) -> bool:
+        shard = self._shard(player)
+        with shard.lock:
+            account = self._get(shard, player)
+            if amount <= 0 or amount > account.balance:
+                return False
+            account.balance -= amount
+            account.reserved += amount
+            self._record(player, kind, amount, account.balance)
+            return True
+    
+    def commit(self, player: str, amount: float, payout: float = 0.0, kind: str = LedgerKind.CASHOUT) -> float:
+        shard = self._shard(player)
+        with shard.lock:
+            account = self._get(shard, player)
+            account.reserved = max(0.0, account.reserved - amount)
+            if payout:
+                account.balance += payout
+                self._record(player, kind, payout, account.balance)
+            return account.balance
+    
+    def refund(self, player: str, amount: float, kind: str = LedgerKind.REFUND) -> float:
+        shard = self._shard(player)
+        with shard.lock:
+            account = self._get(shard, player)
+            returned = min(amount, account.reserved)
+            account.reserved -= returned
+            account.balance += returned
+            self._record(player, kind, returned, account.balance)
+            return account.balance
+    
+    def _shard(self, player: str) -> _Shard:
+        return self._shards[zlib.crc32(player.encode('utf-8')) % len(self._shards)]
+    
+    def _get(self, shard: _Shard, player: str) -> Account:
+        account = shard.accounts.get(player)
+        if account is None:
+            account = Account(player, self.default_balance)
+            shard.accounts[player] = account
+        return account
+    
+    def _record(self, player: str, kind: str, amount: float, balance: float):
+        # Chamado com a trava do shard: o diário vê os saldos na ordem aplicada
+        if self.journal:
+            self.journal(player, kind, amount, balance)
@@ -1,21 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
+from game.core.bet_book import BetBook
+from game.core.events import EventBus, GameEvent
 
 
 class BetItem:
+    __slots__ = ('amount', 'auto_cashout', 'cashed_out', 'cashout_multiplier', 'player')
     
-    def __init__(self, amount: float, auto_cashout: Optional[float] = None):
+    def __init__(self, amount: float, auto_cashout: Optional[float] = None, player: Optional[str] = None):
         self.amount = amount
         self.auto_cashout = auto_cashout
         self.cashed_out = False
         self.cashout_multiplier = 0.0
+        self.player = player
+
+
+class GameSnapshot:
+    __slots__ = ('version', 'state', 'multiplier', 'crash_point', 'countdown', 'round_status', 'can_cashout')
+    
+    def __init__(self):
+        self.version = 0
+        self.state = None
+        self.multiplier = 1.0
+        self.crash_point = 1.0
+        self.countdown = 0
+        self.round_status = ''
+        self.can_cashout = False
 
 
 class BaseGame(ABC):
     
     def __init__(self, name: str):
         self.name = name
-        self.active_bets: List[BetItem] = []
+        self.active_bets = BetBook()
+        # Apostas da última rodada encerrada, fixadas no fim dela: o livro vivo já é da próxima
+        self.settled_bets: List[BetItem] = []
+        self.snapshot = GameSnapshot()
+        self.events = EventBus()
+        self.events.coalesce(GameEvent.BETS_CHANGE, _merge_bet_indices)
     
     @abstractmethod
     def start_new_round(self):
@@ -26,11 +48,15 @@ class BaseGame(ABC):
         pass
     
     @abstractmethod
-    def add_bet(self, amount: float, auto_cashout: Optional[float] = None) -> bool:
+    def add_bet(self, amount: float, auto_cashout: Optional[float] = None, player: Optional[str] = None) -> bool:
         pass
     
     @abstractmethod
-    def cashout_all(self) -> float:
+    def add_bets(self, bets: Iterable[Tuple[float, Optional[float]]], player: Optional[str] = None) -> bool:
+        pass
+    
+    @abstractmethod
+    def cashout_all(self, player: Optional[str] = None) -> float:
         pass
     
     @abstractmethod
@@ -38,7 +64,7 @@ class BaseGame(ABC):
         pass
     
     @abstractmethod
-    def get_game_state(self) -> dict:
+    def get_game_state(self) -> GameSnapshot:
         pass
     
     @abstractmethod
@@ -49,5 +75,33 @@ class BaseGame(ABC):
     def cleanup(self):
         pass
     
+    def advance(self, now: Optional[float] = None):
+        self.update(0)
+    
+    def next_deadline(self) -> Optional[float]:
+        return None
+    
+    def refresh_display(self):
+        self.update(0)
+    
+    def time_until_next_update(self) -> Optional[float]:
+        return 0.0
+    
     def get_active_bets_total(self) -> float:
-        return sum(bet.amount for bet in self.active_bets if not bet.cashed_out)
+        return self.active_bets.open_stake
+    
+    @staticmethod
+    def valid_bets(bets: Sequence[Tuple[float, Optional[float]]]) -> bool:
+        """Lote não vazio, valores positivos e auto cashout ausente ou acima de 1.0x."""
+        if not bets:
+            return False
+        return all(amount > 0 and (auto_cashout is None or auto_cashout > 1.0) for amount, auto_cashout in bets)
+    
+    def _notify_bets_change(self, indices: Optional[List[int]] = None):
+        self.events.emit(GameEvent.BETS_CHANGE, indices)
+
+
+def _merge_bet_indices(previous: Optional[List[int]], indices: Optional[List[int]]) -> Optional[List[int]]:
+    if previous is None or indices is None:
+        return None
+    return previous + indices
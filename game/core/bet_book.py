@@ -0,0 +1,111 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class BetBook:
+    
+    def __init__(self):
+        self._bets: List = []
+        self._pending: List[Tuple[float, int]] = []
+        self._by_player: Dict[str, List[int]] = {}
+        self.total_stake = 0.0
+        self.open_stake = 0.0
+        self.open_count = 0
+    
+    def __len__(self) -> int:
+        return len(self._bets)
+    
+    def __iter__(self) -> Iterator:
+        return iter(self._bets)
+    
+    def __getitem__(self, index: int):
+        return self._bets[index]
+    
+    def append(self, bet) -> int:
+        index = len(self._bets)
+        self._bets.append(bet)
+        self.total_stake += bet.amount
+        if bet.player is not None:
+            self._by_player.setdefault(bet.player, []).append(index)
+        
+        if bet.cashed_out:
+            return index
+        
+        self.open_stake += bet.amount
+        self.open_count += 1
+        if bet.auto_cashout:
+            heapq.heappush(self._pending, (bet.auto_cashout, index))
+        return index
+    
+    def extend(self, bets) -> List[int]:
+        start = len(self._bets)
+        targets = []
+        for bet in bets:
+            index = len(self._bets)
+            self._bets.append(bet)
+            self.total_stake += bet.amount
+            if bet.player is not None:
+                self._by_player.setdefault(bet.player, []).append(index)
+            if bet.cashed_out:
+                continue
+            
+            self.open_stake += bet.amount
+            self.open_count += 1
+            if bet.auto_cashout:
+                targets.append((bet.auto_cashout, index))
+        
+        pending = self._pending
+        if len(targets) > len(pending):
+            pending.extend(targets)
+            heapq.heapify(pending)
+        else:
+            for target in targets:
+                heapq.heappush(pending, target)
+        return list(range(start, len(self._bets)))
+    
+    def settle(self, index: int, multiplier: float) -> float:
+        bet = self._bets[index]
+        if bet.cashed_out:
+            return 0.0
+        
+        bet.cashed_out = True
+        bet.cashout_multiplier = multiplier
+        self.open_count -= 1
+        if self.open_count:
+            self.open_stake -= bet.amount
+        else:
+            self.open_stake = 0.0
+        return bet.amount * multiplier
+    
+    def pop_triggered(self, multiplier: float) -> List[int]:
+        triggered = []
+        pending = self._pending
+        while pending and pending[0][0] <= multiplier:
+            _, index = heapq.heappop(pending)
+            if not self._bets[index].cashed_out:
+                triggered.append(index)
+        return triggered
+    
+    def next_target(self) -> Optional[float]:
+        pending = self._pending
+        while pending and self._bets[pending[0][1]].cashed_out:
+            heapq.heappop(pending)
+        return pending[0][0] if pending else None
+    
+    def open_indices(self, player: Optional[str] = None) -> List[int]:
+        if not self.open_count:
+            return []
+        if player is not None:
+            return [i for i in self._by_player.get(player, ()) if not self._bets[i].cashed_out]
+        return [i for i, bet in enumerate(self._bets) if not bet.cashed_out]
+    
+    def player_indices(self, player: str) -> List[int]:
+        return list(self._by_player.get(player, ()))
+    
+    def clear(self):
+        self._bets = []
+        self._pending = []
+        self._by_player = {}
+        self.total_stake = 0.0
+        self.open_stake = 0.0
+        self.open_count = 0
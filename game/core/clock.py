@@ -0,0 +1,48 @@
+import time
+
+
+class MonotonicClock:
+    speed = 1.0
+    
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class ScaledClock(MonotonicClock):
+    
+    def __init__(self, speed: float = 1.0, start: float = 0.0):
+        self.speed = speed
+        self._start = start
+        self._origin = time.monotonic()
+    
+    def now(self) -> float:
+        return self._start + (time.monotonic() - self._origin) * self.speed
+
+
+class VirtualClock:
+    
+    def __init__(self, start: float = 0.0):
+        self._now = start
+    
+    def now(self) -> float:
+        return self._now
+    
+    def advance(self, dt: float):
+        self._now += dt
+    
+    def advance_to(self, timestamp: float):
+        if timestamp > self._now:
+            self._now = timestamp
+
+
+class SteppedClock(VirtualClock):
+    
+    def __init__(self, step: float = 1 / 60, start: float = 0.0):
+        super().__init__(start)
+        self.step = step
+        self.ticks = 0
+    
+    def tick(self) -> float:
+        self.ticks += 1
+        self._now += self.step
+        return self.step
@@ -0,0 +1,58 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class GameEvent:
+    ROUND_START = "round_start"
+    STATE_CHANGE = "state_change"
+    MULTIPLIER = "multiplier"
+    AUTO_CASHOUT = "auto_cashout"
+    CRASH = "crash"
+    BETS_CHANGE = "bets_change"
+
+
+class EventBus:
+    
+    def __init__(self):
+        self._subscribers: List[Tuple[Callable, Optional[frozenset]]] = []
+        self._pending: List[Tuple[str, object]] = []
+        self._coalesced: Dict[str, int] = {}
+        self._merge: Dict[str, Optional[Callable]] = {}
+    
+    def coalesce(self, name: str, merge: Optional[Callable] = None):
+        self._merge[name] = merge
+    
+    def subscribe(self, callback: Callable, names: Optional[Iterable[str]] = None) -> Callable:
+        self._subscribers.append((callback, frozenset(names) if names is not None else None))
+        return callback
+    
+    def unsubscribe(self, callback: Callable):
+        self._subscribers = [entry for entry in self._subscribers if entry[0] != callback]
+    
+    def emit(self, name: str, payload=None):
+        if not self._subscribers:
+            return
+        
+        if name in self._merge:
+            index = self._coalesced.get(name)
+            if index is not None:
+                merge = self._merge[name]
+                previous = self._pending[index][1]
+                self._pending[index] = (name, merge(previous, payload) if merge else payload)
+                return
+            self._coalesced[name] = len(self._pending)
+        
+        self._pending.append((name, payload))
+    
+    def flush(self):
+        while self._pending:
+            batch = self._pending
+            self._pending = []
+            self._coalesced.clear()
+            
+            for callback, names in list(self._subscribers):
+                if names is None:
+                    callback(batch)
+                else:
+                    events = [event for event in batch if event[0] in names]
+                    if events:
+                        callback(events)
@@ -1,5 +1,11 @@
 from typing import Dict, Optional
+from game.core.accounts import AccountStore
 from game.core.base_game import BaseGame
+from game.core.ledger import Ledger, LedgerKind
+from game.core.table_engine import TableEngine
+
+
+LOCAL_PLAYER = 'local'
 
 
 class GameManager:
@@ -15,25 +21,48 @@ class GameManager:
         if self._initialized:
             return
         
-        self._balance = 1000.0
+        self.player = LOCAL_PLAYER
+        self.accounts = AccountStore()
+        self.accounts.open(self.player, 1000.0)
+        self.accounts.journal = self._journal
         self._games: Dict[str, BaseGame] = {}
         self._current_game: Optional[BaseGame] = None
+        self.engine = TableEngine()
+        self._ledger: Optional[Ledger] = None
         self._initialized = True
     
+    def open_ledger(self, directory: str):
+        self._ledger = Ledger(directory, initial_balance=self.get_balance())
+        self.accounts.open(self.player).balance = self._ledger.balance
+    
+    def commit(self):
+        if self._ledger:
+            self._ledger.commit()
+    
+    def close_ledger(self):
+        if self._ledger:
+            self._ledger.close()
+            self._ledger = None
+    
     def get_balance(self) -> float:
-        return self._balance
+        return self.accounts.balance(self.player)
+    
+    def add_balance(self, amount: float, kind: str = LedgerKind.CREDIT):
+        self.accounts.deposit(self.player, amount, kind)
     
-    def add_balance(self, amount: float):
-        self._balance += amount
+    def subtract_balance(self, amount: float, kind: str = LedgerKind.DEBIT) -> bool:
+        return self.accounts.withdraw(self.player, amount, kind)
     
-    def subtract_balance(self, amount: float) -> bool:
-        if amount > self._balance:
-            return False
-        self._balance -= amount
-        return True
+    def _journal(self, player: str, kind: str, amount: float, balance: float):
+        if self._ledger and player == self.player:
+            self._ledger.record(kind, amount, balance)
     
     def register_game(self, name: str, game: BaseGame):
         self._games[name] = game
+        self.engine.add_table(name, game)
+    
+    def get_game(self, name: str) -> Optional[BaseGame]:
+        return self._games.get(name)
     
     def set_current_game(self, name: str) -> Optional[BaseGame]:
         if name in self._games:
@@ -0,0 +1,87 @@
+import os
+import struct
+from array import array
+from typing import Iterator, List
+
+
+class RingBuffer:
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.appended = 0
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __bool__(self) -> bool:
+        return self._size > 0
+    
+    def __getitem__(self, index: int) -> float:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('RingBuffer index out of range')
+        return self._data[(self._start + index) % self.capacity]
+    
+    def __iter__(self) -> Iterator[float]:
+        for i in range(self._size):
+            yield self._data[(self._start + i) % self.capacity]
+    
+    def append(self, value: float):
+        self.appended += 1
+        if self._size < self.capacity:
+            self._data[(self._start + self._size) % self.capacity] = value
+            self._size += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+    
+    def newest(self, count: int, skip: int = 0) -> List[float]:
+        end = self._size - skip
+        start = max(0, end - count)
+        return [self[i] for i in range(end - 1, start - 1, -1)]
+    
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class HistoryArchive:
+    RECORD = struct.Struct('<d')
+    
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a+b')
+        size = self._file.seek(0, os.SEEK_END)
+        if size % self.RECORD.size:
+            # Um registro pela metade desalinharia todos os seguintes
+            self._file.truncate(size - size % self.RECORD.size)
+        self._count = size // self.RECORD.size
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, value: float):
+        self._file.write(self.RECORD.pack(value))
+        self._file.flush()
+        self._count += 1
+    
+    def newest(self, count: int, skip: int = 0) -> List[float]:
+        end = max(0, self._count - skip)
+        start = max(0, end - count)
+        if end == start:
+            return []
+        
+        self._file.seek(start * self.RECORD.size)
+        values = array('d')
+        values.frombytes(self._file.read((end - start) * self.RECORD.size))
+        values.reverse()
+        return values.tolist()
+    
+    def close(self):
+        self._file.close()
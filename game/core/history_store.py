@@ -0,0 +1,286 @@
+import argparse
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Callable, Iterable, List, Optional, Tuple
+from game.core.events import GameEvent
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    crash_point REAL NOT NULL,
+    bet_count INTEGER NOT NULL,
+    total_stake REAL NOT NULL,
+    total_payout REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bets (
+    round_id INTEGER NOT NULL,
+    player TEXT,
+    amount REAL NOT NULL,
+    auto_cashout REAL,
+    cashout_multiplier REAL,
+    payout REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_ended_at ON rounds (ended_at);
+CREATE INDEX IF NOT EXISTS rounds_crash_point ON rounds (crash_point, ended_at);
+CREATE INDEX IF NOT EXISTS bets_round ON bets (round_id);
+CREATE INDEX IF NOT EXISTS bets_player ON bets (player, round_id);
+"""
+
+_FIRST_ID_AFTER = 'coalesce((SELECT id FROM rounds WHERE ended_at >= ? ORDER BY ended_at LIMIT 1), 1 << 62)'
+_STOP = object()
+
+log = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    """Histórico persistente de rodadas e apostas em SQLite (WAL).
+    
+    ``record_round`` só enfileira: uma thread própria agrupa até
+    ``batch_rounds`` rodadas (ou o que chegou em ``flush_interval``
+    segundos) e grava tudo numa única transação. As consultas abrem uma
+    conexão de leitura por thread; com WAL elas não esperam o escritor.
+    Com ``read_only`` o banco precisa existir e não há thread de escrita.
+    """
+    
+    def __init__(self, path: str, batch_rounds: int = 50, flush_interval: float = 1.0,
+                 clock: Callable[[], float] = time.time, read_only: bool = False):
+        if read_only and not os.path.exists(path):
+            raise FileNotFoundError(f'histórico não encontrado: {path}')
+        directory = os.path.dirname(path)
+        if directory and not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.read_only = read_only
+        self.batch_rounds = batch_rounds
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+        self._game = None
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        if read_only:
+            return
+        
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+        self._writer = threading.Thread(target=self._run_writer, name='history-store', daemon=True)
+        self._writer.start()
+    
+    def __len__(self) -> int:
+        return self._reader().execute('SELECT count(*) FROM rounds').fetchone()[0]
+    
+    def attach(self, game):
+        self._game = game
+        game.events.subscribe(self._on_game_events, (GameEvent.CRASH,))
+    
+    def detach(self):
+        if self._game is not None:
+            self._game.events.unsubscribe(self._on_game_events)
+            self._game = None
+    
+    def record_round(self, crash_point: float, bets: Iterable, ended_at: Optional[float] = None):
+        """Enfileira a rodada; ``bets`` são os ``BetItem`` da rodada, lidos só na thread de escrita."""
+        if self.read_only:
+            raise ValueError(f'histórico aberto só para leitura: {self.path}')
+        self._queue.put((self.clock() if ended_at is None else ended_at, crash_point, list(bets)))
+    
+    def flush(self):
+        """Bloqueia até tudo que foi enfileirado estar gravado; repassa a falha de gravação, se houve."""
+        self._queue.join()
+        self._raise_error()
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.detach()
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+        self._raise_error()
+    
+    def rounds(self, since: Optional[float] = None, until: Optional[float] = None,
+               min_crash: Optional[float] = None, max_crash: Optional[float] = None,
+               limit: Optional[int] = None) -> List[Tuple[int, float, float, int, float, float]]:
+        """(id, ended_at, crash_point, bet_count, total_stake, total_payout) em ordem cronológica."""
+        where, params = self._range(since, until)
+        if min_crash is not None:
+            where.append('crash_point >= ?')
+            params.append(min_crash)
+        if max_crash is not None:
+            where.append('crash_point < ?')
+            params.append(max_crash)
+        sql = 'SELECT id, ended_at, crash_point, bet_count, total_stake, total_payout FROM rounds'
+        sql += self._where(where) + ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self._reader().execute(sql, params).fetchall()
+    
+    def crash_points(self, since: Optional[float] = None, until: Optional[float] = None) -> List[float]:
+        where, params = self._range(since, until)
+        sql = 'SELECT crash_point FROM rounds' + self._where(where) + ' ORDER BY id'
+        return [row[0] for row in self._reader().execute(sql, params)]
+    
+    def totals_by_period(self, period: float = 3600, since: Optional[float] = None,
+                         until: Optional[float] = None) -> List[Tuple[float, int, float, float]]:
+        """(início do período, rodadas, aposta total, pagamento total) por janela de ``period`` segundos."""
+        where, params = self._range(since, until)
+        sql = ('SELECT CAST(ended_at / ? AS INTEGER) * ? AS bucket, count(*), sum(total_stake), sum(total_payout) '
+               'FROM rounds' + self._where(where) + ' GROUP BY bucket ORDER BY bucket')
+        return self._reader().execute(sql, [period, period] + params).fetchall()
+    
+    def player_bets(self, player: str, since: Optional[float] = None,
+                    until: Optional[float] = None) -> List[Tuple[int, float, float, float, Optional[float], float]]:
+        """(round_id, ended_at, amount, auto_cashout, cashout_multiplier, payout) das apostas do jogador."""
+        where, params = self._range(since, until, 'b.round_id')
+        where.insert(0, 'b.player = ?')
+        params.insert(0, player)
+        sql = ('SELECT b.round_id, r.ended_at, b.amount, b.auto_cashout, b.cashout_multiplier, b.payout '
+               'FROM bets b JOIN rounds r ON r.id = b.round_id' + self._where(where) + ' ORDER BY b.round_id')
+        return self._reader().execute(sql, params).fetchall()
+    
+    def _on_game_events(self, events):
+        for name, payload in events:
+            if name == GameEvent.CRASH:
+                self.record_round(payload, self._game.settled_bets)
+    
+    def _raise_error(self):
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = f'file:{urllib.parse.quote(os.path.abspath(self.path))}?mode=ro'
+            return sqlite3.connect(uri, uri=True, check_same_thread=False)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+    
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+    
+    def _run_writer(self):
+        connection = self._connect()
+        next_id = (connection.execute('SELECT max(id) FROM rounds').fetchone()[0] or 0) + 1
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_rounds and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            try:
+                next_id = self._write_batch(connection, batch, next_id)
+            except Exception as error:
+                # A thread continua viva para a fila não travar ``flush``; o lote se perde
+                log.error('HistoryStore: falha ao gravar %d rodadas em %s: %r', len(batch), self.path, error)
+                self.error = error
+            finally:
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+        connection.close()
+    
+    def _write_batch(self, connection: sqlite3.Connection, batch, next_id: int) -> int:
+        if not batch:
+            return next_id
+        
+        round_rows = []
+        bet_rows = []
+        for ended_at, crash_point, bets in batch:
+            stake = payout_total = 0.0
+            for bet in bets:
+                payout = bet.amount * bet.cashout_multiplier if bet.cashed_out else 0.0
+                stake += bet.amount
+                payout_total += payout
+                bet_rows.append((next_id, bet.player, bet.amount, bet.auto_cashout,
+                                 bet.cashout_multiplier if bet.cashed_out else None, payout))
+            round_rows.append((next_id, ended_at, crash_point, len(bets), stake, payout_total))
+            next_id += 1
+        
+        with connection:
+            connection.executemany('INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)', round_rows)
+            connection.executemany('INSERT INTO bets VALUES (?, ?, ?, ?, ?, ?)', bet_rows)
+        return next_id
+    
+    @staticmethod
+    def _range(since, until, column='id'):
+        # Rodadas entram em ordem cronológica: o intervalo de tempo vira um intervalo de
+        # ids (duas buscas no índice de ended_at) e a varredura segue a ordem da tabela
+        where, params = [], []
+        if since is not None:
+            where.append(f'{column} >= {_FIRST_ID_AFTER}')
+            params.append(since)
+        if until is not None:
+            where.append(f'{column} < {_FIRST_ID_AFTER}')
+            params.append(until)
+        return where, params
+    
+    @staticmethod
+    def _where(conditions) -> str:
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Consulta o histórico de rodadas gravado em SQLite.')
+    parser.add_argument('path', nargs='?', default='data/history.db')
+    parser.add_argument('--days', type=float, default=7, help='janela até agora, em dias')
+    parser.add_argument('--min-crash', type=float, default=None)
+    parser.add_argument('--period', type=float, default=None, help='agrega aposta e pagamento por janela (segundos)')
+    parser.add_argument('--player', default=None)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+    
+    try:
+        store = HistoryStore(args.path, read_only=True)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    since = time.time() - args.days * 86400
+    started = time.perf_counter()
+    if args.period:
+        rows = store.totals_by_period(args.period, since=since)
+        for bucket, count, stake, payout in rows:
+            print(f'{time.strftime("%Y-%m-%d %H:%M", time.localtime(bucket))}  {count:>6} rodadas  '
+                  f'apostado R$ {stake:,.2f}  pago R$ {payout:,.2f}')
+    elif args.player:
+        rows = store.player_bets(args.player, since=since)
+        for round_id, ended_at, amount, auto_cashout, multiplier, payout in rows[-args.limit:]:
+            exit_text = f'{multiplier:.2f}x' if multiplier else 'perdeu'
+            print(f'#{round_id} {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ended_at))}  '
+                  f'R$ {amount:.2f} -> {exit_text}  pago R$ {payout:.2f}')
+    else:
+        rows = store.rounds(since=since, min_crash=args.min_crash)
+        for round_id, ended_at, crash_point, count, stake, payout in rows[-args.limit:]:
+            print(f'#{round_id} {time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ended_at))}  {crash_point:6.2f}x  '
+                  f'{count} apostas  R$ {stake:,.2f} / R$ {payout:,.2f}')
+    print(f'{len(rows)} linhas em {(time.perf_counter() - started) * 1000:.1f} ms')
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import json
+import os
+import time
+from typing import List
+
+
+class LedgerKind:
+    DEBIT = "debit"
+    CREDIT = "credit"
+    BET = "bet"
+    CASHOUT = "cashout"
+    REFUND = "refund"
+
+
+class Ledger:
+    LOG_FILE = 'ledger.log'
+    SNAPSHOT_FILE = 'snapshot.json'
+    
+    def __init__(self, directory: str, initial_balance: float = 0.0, snapshot_interval: int = 1000):
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, self.LOG_FILE)
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.snapshot_interval = snapshot_interval
+        self.balance = initial_balance
+        self.seq = 0
+        self._pending: List[str] = []
+        self._since_snapshot = 0
+        
+        self._recover()
+        self._log = open(self._log_path, 'ab')
+    
+    def record(self, kind: str, amount: float, balance: float):
+        self.seq += 1
+        self.balance = balance
+        self._pending.append(json.dumps({
+            'seq': self.seq,
+            'ts': time.time(),
+            'kind': kind,
+            'amount': amount,
+            'balance': balance,
+        }, separators=(',', ':')) + '\n')
+    
+    def commit(self):
+        if not self._pending:
+            return
+        
+        self._log.write(''.join(self._pending).encode('utf-8'))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._since_snapshot += len(self._pending)
+        self._pending = []
+        
+        if self._since_snapshot >= self.snapshot_interval:
+            self.write_snapshot()
+    
+    def write_snapshot(self):
+        tmp_path = self._snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': self.seq, 'balance': self.balance, 'offset': self._log.tell()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        self._since_snapshot = 0
+    
+    def close(self):
+        self.commit()
+        self._log.close()
+    
+    def _recover(self):
+        offset = 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.seq = snapshot['seq']
+            self.balance = snapshot['balance']
+            offset = snapshot['offset']
+        
+        if not os.path.exists(self._log_path):
+            return
+        
+        valid_end = offset
+        with open(self._log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.seq = entry['seq']
+                self.balance = entry['balance']
+                self._since_snapshot += 1
+                valid_end += len(line)
+        
+        if os.path.getsize(self._log_path) > valid_end:
+            os.truncate(self._log_path, valid_end)
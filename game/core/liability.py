@@ -0,0 +1,105 @@
+import bisect
+from array import array
+from typing import Dict, List
+
+
+class _FenwickTree:
+    __slots__ = ('_tree',)
+    
+    def __init__(self, values: List[float]):
+        tree = array('d', [0.0])
+        tree.extend(values)
+        size = len(values)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+    
+    def add(self, position: int, delta: float):
+        tree = self._tree
+        i = position + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+    
+    def prefix(self, count: int) -> float:
+        """Soma das ``count`` primeiras posições."""
+        tree = self._tree
+        total = 0.0
+        i = count
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class LiabilityIndex:
+    """Quanto a casa deve em cada ponto de crash durante o voo.
+    
+    Montado quando as apostas fecham, com as apostas de auto-cashout ordenadas
+    pelo alvo e somas de prefixo (árvores de Fenwick) de aposta e de
+    aposta × alvo. Consultas e saques manuais custam O(log n).
+    
+    Uma aposta com alvo ``t`` paga ``valor * t`` se o crash for em ``t`` ou
+    depois; as apostas sem alvo só pagam quando sacadas manualmente.
+    """
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.settled_payout = 0.0
+        self.manual_stake = 0.0
+        self._targets: List[float] = []
+        self._positions: Dict[int, int] = {}
+        self._stakes = _FenwickTree([])
+        self._payouts = _FenwickTree([])
+        self._auto_stake = 0.0
+    
+    def build(self, bets):
+        self.clear()
+        auto = []
+        for index, bet in enumerate(bets):
+            if bet.cashed_out:
+                self.settled_payout += bet.amount * bet.cashout_multiplier
+            elif bet.auto_cashout:
+                auto.append((bet.auto_cashout, index, bet.amount))
+            else:
+                self.manual_stake += bet.amount
+        
+        auto.sort()
+        self._targets = [target for target, _, _ in auto]
+        self._positions = {index: position for position, (_, index, _) in enumerate(auto)}
+        self._stakes = _FenwickTree([amount for _, _, amount in auto])
+        self._payouts = _FenwickTree([amount * target for target, _, amount in auto])
+        self._auto_stake = sum(amount for _, _, amount in auto)
+    
+    def cash_out(self, index: int, bet, multiplier: float):
+        """Registra o saque manual de uma aposta que ainda estava aberta."""
+        self.settled_payout += bet.amount * multiplier
+        position = self._positions.pop(index, None)
+        if position is None:
+            self.manual_stake -= bet.amount
+            return
+        self._stakes.add(position, -bet.amount)
+        self._payouts.add(position, -bet.amount * bet.auto_cashout)
+        self._auto_stake -= bet.amount
+    
+    def payout_if_crash_at(self, multiplier: float) -> float:
+        """Total pago na rodada se o crash for em ``multiplier`` e ninguém mais sacar na mão."""
+        count = bisect.bisect_right(self._targets, multiplier)
+        return self.settled_payout + self._payouts.prefix(count)
+    
+    def open_exposure(self, multiplier: float) -> float:
+        """Quanto as apostas ainda abertas em ``multiplier`` receberiam se sacassem agora."""
+        count = bisect.bisect_right(self._targets, multiplier)
+        return multiplier * (self.manual_stake + self._auto_stake - self._stakes.prefix(count))
+    
+    def worst_case_at(self, multiplier: float) -> float:
+        """Pior caso com crash em ``multiplier``: alvos atingidos pagam e todo o resto saca no topo."""
+        return self.payout_if_crash_at(multiplier) + self.open_exposure(multiplier)
+    
+    def max_liability(self, cap: float) -> float:
+        """Pior caso para qualquer crash até ``cap``; cresce com o multiplicador, então é o valor em ``cap``."""
+        return self.worst_case_at(cap)
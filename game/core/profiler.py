@@ -0,0 +1,151 @@
+import functools
+import json
+import math
+import time
+from array import array
+from typing import Callable, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """Histograma de tempos com baldes logarítmicos de tamanho fixo.
+    
+    Cobre de ``min_value`` segundos a ``min_value * 2**octaves`` com
+    ``per_octave`` baldes por oitava; valores fora da faixa caem nas pontas.
+    """
+    
+    __slots__ = ('min_value', 'per_octave', 'counts', 'count', 'total', 'max')
+    
+    def __init__(self, min_value: float = 1e-6, octaves: int = 24, per_octave: int = 8):
+        self.min_value = min_value
+        self.per_octave = per_octave
+        self.counts = array('L', bytes(array('L').itemsize * octaves * per_octave))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        if seconds > self.min_value:
+            index = min(int(math.log2(seconds / self.min_value) * self.per_octave), len(self.counts) - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def merge(self, other: 'LatencyHistogram'):
+        for index, bucket in enumerate(other.counts):
+            self.counts[index] += bucket
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+    
+    def upper_bound(self, index: int) -> float:
+        return self.min_value * 2 ** ((index + 1) / self.per_octave)
+    
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def to_dict(self) -> dict:
+        buckets = [(self.upper_bound(i), n) for i, n in enumerate(self.counts) if n]
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'max': self.max,
+            'p50': self.quantile(0.50),
+            'p90': self.quantile(0.90),
+            'p99': self.quantile(0.99),
+            'buckets': [{'le': bound, 'count': n} for bound, n in buckets],
+        }
+
+
+class FrameProfiler:
+    """Tempos por fase do loop de tela, gravados em histogramas fixos.
+    
+    Desligado, não custa nada: a instrumentação troca métodos por versões
+    cronometradas na própria instância, e só quando o profiler está ligado.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: Dict[str, LatencyHistogram] = {}
+    
+    def enable(self):
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def histogram(self, phase: str) -> LatencyHistogram:
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        return histogram
+    
+    def record(self, phase: str, seconds: float):
+        self.histogram(phase).record(seconds)
+    
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        histogram = self.histogram(phase)
+        perf_counter = time.perf_counter
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter() - start)
+        timed.profiled_phase = phase
+        return timed
+    
+    def instrument(self, obj, phases: Dict[str, str]):
+        """Substitui ``obj.<método>`` por uma versão cronometrada para cada fase."""
+        if not self.enabled:
+            return
+        for attr, phase in phases.items():
+            method = getattr(obj, attr, None)
+            if method is None or hasattr(method, 'profiled_phase'):
+                continue
+            setattr(obj, attr, self.wrap(phase, method))
+    
+    def summary(self, order: Optional[List[str]] = None) -> List[tuple]:
+        names = order or sorted(self.phases)
+        return [(name, self.phases[name]) for name in names if name in self.phases]
+    
+    def reset(self):
+        for histogram in self.phases.values():
+            histogram.reset()
+    
+    def dump(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'unit': 's',
+                'phases': {name: histogram.to_dict() for name, histogram in self.phases.items()},
+            }, f, indent=2)
+
+
+profiler = FrameProfiler()
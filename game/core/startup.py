@@ -0,0 +1,27 @@
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupTimer:
+    """Marca o fim de cada fase da inicialização e relata a duração de cada uma."""
+    
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.started
+    
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+    
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+    
+    def report(self) -> str:
+        lines = [f'{phase:<16}{elapsed * 1000:>9.1f} ms' for phase, elapsed in self.phases]
+        lines.append(f'{"total":<16}{self.total * 1000:>9.1f} ms')
+        return '\n'.join(lines)
@@ -0,0 +1,195 @@
+import bisect
+from array import array
+from typing import Dict, List, Sequence
+from game.core.history import RingBuffer
+
+
+class P2Quantile:
+    """Quantil estimado em fluxo pelo algoritmo P² (Jain & Chlamtac).
+    
+    Guarda só cinco marcadores: memória constante e O(1) por valor,
+    independente de quantos valores já passaram.
+    """
+    
+    __slots__ = ('p', 'count', '_heights', '_positions', '_increments')
+    
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+    
+    def add(self, value: float):
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            bisect.insort(heights, value)
+            return
+        
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, value) - 1
+        
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        
+        # Posição desejada do marcador i depois de ``count`` valores: (count - 1) * incremento
+        last = self.count - 1
+        increments = self._increments
+        for i in (1, 2, 3):
+            d = last * increments[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+    
+    @property
+    def value(self) -> float:
+        if not self.count:
+            return 0.0
+        if self.count <= 5:
+            return self._heights[round(self.p * (self.count - 1))]
+        return self._heights[2]
+
+
+class WindowedMean:
+    """Média das últimas ``window`` entradas com soma corrente."""
+    
+    __slots__ = ('_values', '_sum')
+    
+    def __init__(self, window: int):
+        self._values = RingBuffer(window)
+        self._sum = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def add(self, value: float):
+        values = self._values
+        if len(values) == values.capacity:
+            self._sum -= values[0]
+        values.append(value)
+        self._sum += value
+        
+        # Refaz a soma a cada volta completa para não acumular erro de arredondamento
+        if values.appended % values.capacity == 0:
+            self._sum = sum(values)
+    
+    @property
+    def value(self) -> float:
+        return self._sum / len(self._values) if self._values else 0.0
+
+
+class RoundStats:
+    """Estatísticas dos crash points em fluxo: O(1) por rodada e memória constante."""
+    
+    QUANTILES = (0.5, 0.9, 0.99)
+    
+    def __init__(self, band_edges: Sequence[float] = (2.0, 5.0, 10.0), window: int = 100,
+                 streak_threshold: float = 2.0):
+        self.band_edges = tuple(band_edges)
+        self.window = window
+        self.streak_threshold = streak_threshold
+        self.count = 0
+        self.total = 0.0
+        self.minimum = 0.0
+        self.maximum = 0.0
+        self.band_counts = array('L', bytes(array('L').itemsize * (len(self.band_edges) + 1)))
+        self.streak_below = False
+        self.streak_length = 0
+        self.longest_below = 0
+        self.longest_above = 0
+        self._recent = WindowedMean(window)
+        self._quantiles = {p: P2Quantile(p) for p in self.QUANTILES}
+    
+    def add(self, crash_point: float):
+        if not self.count:
+            self.minimum = self.maximum = crash_point
+        else:
+            self.minimum = min(self.minimum, crash_point)
+            self.maximum = max(self.maximum, crash_point)
+        self.count += 1
+        self.total += crash_point
+        self._recent.add(crash_point)
+        for quantile in self._quantiles.values():
+            quantile.add(crash_point)
+        self.band_counts[bisect.bisect_right(self.band_edges, crash_point)] += 1
+        self._update_streak(crash_point < self.streak_threshold)
+    
+    def _update_streak(self, below: bool):
+        if self.streak_length and below == self.streak_below:
+            self.streak_length += 1
+        else:
+            self.streak_below = below
+            self.streak_length = 1
+        
+        if below:
+            self.longest_below = max(self.longest_below, self.streak_length)
+        else:
+            self.longest_above = max(self.longest_above, self.streak_length)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    @property
+    def recent_mean(self) -> float:
+        return self._recent.value
+    
+    @property
+    def median(self) -> float:
+        return self.quantile(0.5)
+    
+    def quantile(self, p: float) -> float:
+        return self._quantiles[p].value
+    
+    def band_labels(self) -> List[str]:
+        edges = (1.0,) + self.band_edges
+        labels = [f'{low:.1f}x - {high:.1f}x' for low, high in zip(edges, edges[1:])]
+        labels.append(f'{edges[-1]:.1f}x+')
+        return labels
+    
+    def band_frequencies(self) -> List[float]:
+        return [n / self.count if self.count else 0.0 for n in self.band_counts]
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'recent_mean': self.recent_mean,
+            'min': self.minimum,
+            'max': self.maximum,
+            'quantiles': {p: self.quantile(p) for p in self.QUANTILES},
+            'bands': dict(zip(self.band_labels(), self.band_frequencies())),
+            'streak': {'below': self.streak_below, 'length': self.streak_length},
+            'longest_below': self.longest_below,
+            'longest_above': self.longest_above,
+        }
+    
+    def summary(self) -> str:
+        if not self.count:
+            return 'Sem rodadas ainda'
+        streak = 'abaixo' if self.streak_below else 'acima'
+        return (
+            f'Média {self.mean:.2f}x (últimas {len(self._recent)}: {self.recent_mean:.2f}x) · '
+            f'Mediana {self.median:.2f}x · p90 {self.quantile(0.9):.2f}x · p99 {self.quantile(0.99):.2f}x · '
+            f'Sequência: {self.streak_length} {streak} de {self.streak_threshold:.1f}x'
+        )
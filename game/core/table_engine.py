@@ -0,0 +1,96 @@
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+from game.core.base_game import BaseGame
+from game.core.clock import MonotonicClock
+from game.core.events import GameEvent
+
+
+class TableEngine:
+    
+    def __init__(self, clock=None):
+        self.clock = clock or MonotonicClock()
+        self.on_schedule: Optional[Callable] = None
+        self._tables: Dict[str, BaseGame] = {}
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._tokens: Dict[str, int] = {}
+        self._scheduled_at: Dict[str, float] = {}
+        self._listeners: Dict[str, Callable] = {}
+        self._seq = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._tables)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._tables
+    
+    def add_table(self, name: str, game: BaseGame):
+        if name in self._tables:
+            self.remove_table(name)
+        
+        if hasattr(game, 'clock'):
+            game.clock = self.clock
+        self._tables[name] = game
+        self._listeners[name] = game.events.subscribe(
+            lambda events, name=name: self.reschedule(name),
+            (GameEvent.ROUND_START, GameEvent.STATE_CHANGE),
+        )
+        self.reschedule(name)
+    
+    def remove_table(self, name: str) -> Optional[BaseGame]:
+        game = self._tables.pop(name, None)
+        if game is None:
+            return None
+        game.events.unsubscribe(self._listeners.pop(name))
+        self._tokens.pop(name, None)
+        self._scheduled_at.pop(name, None)
+        return game
+    
+    def get_table(self, name: str) -> Optional[BaseGame]:
+        return self._tables.get(name)
+    
+    def tables(self) -> Dict[str, BaseGame]:
+        return dict(self._tables)
+    
+    def reschedule(self, name: str):
+        deadline = self._tables[name].next_deadline()
+        if deadline is None:
+            self._tokens.pop(name, None)
+            self._scheduled_at.pop(name, None)
+            return
+        
+        if self._scheduled_at.get(name) == deadline:
+            return
+        
+        earliest = self.next_deadline()
+        token = next(self._seq)
+        self._tokens[name] = token
+        self._scheduled_at[name] = deadline
+        heapq.heappush(self._deadlines, (deadline, token, name))
+        
+        if self.on_schedule and (earliest is None or deadline < earliest):
+            self.on_schedule(deadline)
+    
+    def next_deadline(self) -> Optional[float]:
+        deadlines = self._deadlines
+        while deadlines and self._tokens.get(deadlines[0][2]) != deadlines[0][1]:
+            heapq.heappop(deadlines)
+        return deadlines[0][0] if deadlines else None
+    
+    def tick(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = self.clock.now()
+        
+        processed = 0
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, token, name = heapq.heappop(deadlines)
+            if self._tokens.get(name) != token:
+                continue
+            
+            del self._tokens[name]
+            del self._scheduled_at[name]
+            self._tables[name].advance(now)
+            self.reschedule(name)
+            processed += 1
+        return processed
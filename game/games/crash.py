@@ -1,7 +1,22 @@
 import random
-import time
-from typing import Optional, Callable
-from game.core.base_game import BaseGame, BetItem
+from typing import Callable, Iterable, Optional, Tuple
+from game.core.base_game import BaseGame, BetItem, GameSnapshot
+from game.core.clock import MonotonicClock
+from game.core.events import GameEvent
+from game.core.history import RingBuffer
+from game.core.liability import LiabilityIndex
+from game.core.stats import RoundStats
+
+
+BETTING_DURATION = 5
+MULTIPLIER_GROWTH = 0.5
+
+CRASH_BANDS = (
+    (0.50, 1.0, 2.0),
+    (0.30, 2.0, 5.0),
+    (0.15, 5.0, 10.0),
+    (0.05, 10.0, 50.0),
+)
 
 
 class GameState:
@@ -12,165 +27,269 @@ class GameState:
 
 
 class CrashBetItem(BetItem):
+    __slots__ = ()
     
-    def __init__(self, amount: float, auto_cashout: Optional[float] = None):
-        super().__init__(amount, auto_cashout)
+    def __init__(self, amount: float, auto_cashout: Optional[float] = None, player: Optional[str] = None):
+        super().__init__(amount, auto_cashout, player)
 
 
 class CrashGame(BaseGame):
     
-    def __init__(self):
+    def __init__(self, clock=None, rng=None, auto_restart: bool = False,
+                 crash_source: Optional[Callable[[], float]] = None):
         super().__init__("Crash")
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random
+        self.crash_source = crash_source
         self.state = GameState.WAITING
         self.multiplier = 1.0
         self.crash_multiplier = 1.0
         self.countdown_timer = 5
-        self.round_interval = 3
-        self.last_results = []
+        self.round_interval = 2
+        self.auto_restart = auto_restart
         self.max_history = 20
+        self.last_results = RingBuffer(self.max_history)
+        self.stats = RoundStats(band_edges=[low for _, low, _ in CRASH_BANDS[1:]])
+        self.liability = LiabilityIndex()
         
-        self.on_state_change: Optional[Callable] = None
-        self.on_multiplier_update: Optional[Callable] = None
-        self.on_crash: Optional[Callable] = None
-        self.on_auto_cashout: Optional[Callable] = None
-        self.on_round_start: Optional[Callable] = None
+        self.events.coalesce(GameEvent.MULTIPLIER)
+        self._sync_snapshot()
         
-        self._last_update_time = time.time()
         self._betting_start_time = 0
         self._flying_start_time = 0
+        self._crash_time = 0
     
     def start_new_round(self):
-        self.state = GameState.BETTING
-        self.multiplier = 1.0
-        self.countdown_timer = 5
-        self.active_bets = []
-        self._betting_start_time = time.time()
-        self.crash_multiplier = self._generate_crash_point()
-        
-        if self.on_round_start:
-            self.on_round_start()
-        
-        if self.on_state_change:
-            self.on_state_change(self.state, self.countdown_timer)
+        self._begin_round(self.clock.now())
+        self._publish()
     
     def can_bet(self) -> bool:
         return self.state == GameState.BETTING
     
-    def add_bet(self, amount: float, auto_cashout: Optional[float] = None) -> bool:
+    def add_bet(self, amount: float, auto_cashout: Optional[float] = None, player: Optional[str] = None) -> bool:
         if not self.can_bet():
             return False
         
-        bet = CrashBetItem(amount, auto_cashout)
-        self.active_bets.append(bet)
+        bet = CrashBetItem(amount, auto_cashout, player)
+        index = self.active_bets.append(bet)
+        self._notify_bets_change([index])
+        self._publish()
         return True
     
-    def cashout_all(self) -> float:
+    def add_bets(self, bets: Iterable[Tuple[float, Optional[float]]], player: Optional[str] = None) -> bool:
+        if not self.can_bet():
+            return False
+        
+        bets = list(bets)
+        if not self.valid_bets(bets):
+            return False
+        
+        items = [CrashBetItem(amount, auto_cashout, player) for amount, auto_cashout in bets]
+        self._notify_bets_change(self.active_bets.extend(items))
+        self._publish()
+        return True
+    
+    def cashout_all(self, player: Optional[str] = None) -> float:
+        self._advance(self.clock.now())
         if self.state != GameState.FLYING:
+            self._publish()
             return 0.0
         
+        self.multiplier = min(self.multiplier_at(self.clock.now()), self.crash_multiplier)
         total_winnings = 0.0
-        for bet in self.active_bets:
-            if not bet.cashed_out:
-                winnings = bet.amount * self.multiplier
-                total_winnings += winnings
-                bet.cashed_out = True
-                bet.cashout_multiplier = self.multiplier
+        changed = self.active_bets.open_indices(player)
+        for i in changed:
+            total_winnings += self.active_bets.settle(i, self.multiplier)
+            self.liability.cash_out(i, self.active_bets[i], self.multiplier)
         
+        if changed:
+            self._notify_bets_change(changed)
+        self._publish()
         return total_winnings
     
     def clear_bets(self) -> float:
         if self.state != GameState.BETTING:
             return 0.0
         
-        total_returned = sum(bet.amount for bet in self.active_bets)
-        self.active_bets = []
+        total_returned = self.active_bets.total_stake
+        self.active_bets.clear()
+        self._notify_bets_change()
+        self._publish()
         return total_returned
     
-    def get_game_state(self) -> dict:
-        return {
-            'state': self.state,
-            'multiplier': self.multiplier,
-            'crash_point': self.crash_multiplier,
-            'countdown': self.countdown_timer,
-            'round_status': self._get_status_text(),
-            'can_cashout': self.state == GameState.FLYING and any(not bet.cashed_out for bet in self.active_bets),
-        }
+    def get_game_state(self) -> GameSnapshot:
+        return self.snapshot
     
     def update(self, dt: float):
-        current_time = time.time()
-        
-        if self.state == GameState.BETTING:
-            elapsed = current_time - self._betting_start_time
-            remaining = 5 - int(elapsed)
-            
-            if remaining != self.countdown_timer:
-                self.countdown_timer = max(0, remaining)
-                if self.on_state_change:
-                    self.on_state_change(self.state, self.countdown_timer)
-            
-            if elapsed >= 5:
-                self._start_flying()
-        
-        elif self.state == GameState.FLYING:
-            elapsed = current_time - self._flying_start_time
-            self.multiplier = 1.0 + (elapsed * 0.5)
+        current_time = self.clock.now()
+        self._advance(current_time)
+        self._refresh_multiplier(current_time)
+        self._publish()
+    
+    def refresh_display(self):
+        self._refresh_multiplier(self.clock.now())
+        self._publish()
+    
+    def advance(self, now: Optional[float] = None):
+        self._advance(self.clock.now() if now is None else now)
+        self._publish()
+    
+    def _advance(self, now: float):
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return
             
-            if self.on_multiplier_update:
-                self.on_multiplier_update(self.multiplier)
+            if self.state == GameState.BETTING:
+                self.countdown_timer -= 1
+                self.events.emit(GameEvent.STATE_CHANGE, (self.state, self.countdown_timer))
+                
+                if self.countdown_timer <= 0:
+                    self._start_flying(deadline)
             
-            self._check_auto_cashouts()
+            elif self.state == GameState.FLYING:
+                self._check_auto_cashouts(now)
+                
+                if now >= self._crash_time:
+                    self._crash()
+                    # Entrega o crash com as apostas da rodada ainda no livro
+                    self._publish()
             
-            if self.multiplier >= self.crash_multiplier:
-                self._crash()
+            elif self.state == GameState.CRASHED:
+                self._begin_round(deadline)
+    
+    def next_deadline(self) -> Optional[float]:
+        if self.state == GameState.BETTING:
+            return self._next_countdown_time()
+        
+        if self.state == GameState.FLYING:
+            target = self.active_bets.next_target()
+            if target is not None and target <= self.crash_multiplier:
+                return min(self.time_at_multiplier(target), self._crash_time)
+            return self._crash_time
+        
+        if self.state == GameState.CRASHED and self.auto_restart:
+            return self._crash_time + self.round_interval
+        
+        return None
+    
+    def time_until_next_update(self) -> Optional[float]:
+        if self.state == GameState.FLYING:
+            return 0.0
+        
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock.now())
+    
+    def multiplier_at(self, timestamp: float) -> float:
+        return 1.0 + (timestamp - self._flying_start_time) * MULTIPLIER_GROWTH
+    
+    def time_at_multiplier(self, multiplier: float) -> float:
+        return self._flying_start_time + (multiplier - 1.0) / MULTIPLIER_GROWTH
+    
+    def betting_started_at(self) -> float:
+        return self._betting_start_time
     
     def cleanup(self):
-        self.active_bets = []
+        self.active_bets.clear()
         self.state = GameState.WAITING
+        self._notify_bets_change()
+        self._publish()
     
     def _generate_crash_point(self) -> float:
-        rand = random.random()
-        
-        if rand < 0.50:
-            return random.uniform(1.0, 2.0)
-        elif rand < 0.80:
-            return random.uniform(2.0, 5.0)
-        elif rand < 0.95:
-            return random.uniform(5.0, 10.0)
-        else:
-            return random.uniform(10.0, 50.0)
-    
-    def _start_flying(self):
-        self.state = GameState.FLYING
+        rand = self.rng.random()
+        
+        threshold = 0.0
+        for probability, low, high in CRASH_BANDS:
+            threshold += probability
+            if rand < threshold:
+                return self.rng.uniform(low, high)
+        return self.rng.uniform(low, high)
+    
+    def _begin_round(self, start_time: float):
+        self.state = GameState.BETTING
         self.multiplier = 1.0
-        self._flying_start_time = time.time()
+        self.countdown_timer = BETTING_DURATION
+        self.active_bets.clear()
+        self.liability.clear()
+        self._betting_start_time = start_time
+        self.crash_multiplier = self.crash_source() if self.crash_source else self._generate_crash_point()
+        self._notify_bets_change()
+        
+        self.events.emit(GameEvent.ROUND_START)
+        self.events.emit(GameEvent.STATE_CHANGE, (self.state, self.countdown_timer))
+    
+    def _refresh_multiplier(self, now: float):
+        if self.state == GameState.FLYING:
+            self.multiplier = min(self.multiplier_at(now), self.crash_multiplier)
+            self.events.emit(GameEvent.MULTIPLIER, self.multiplier)
+    
+    def _publish(self):
+        self._sync_snapshot()
+        self.events.flush()
+    
+    def _sync_snapshot(self):
+        snapshot = self.snapshot
+        changed = False
+        
+        if snapshot.state != self.state or snapshot.crash_point != self.crash_multiplier:
+            snapshot.state = self.state
+            snapshot.crash_point = self.crash_multiplier
+            snapshot.round_status = self._get_status_text()
+            changed = True
+        
+        if snapshot.multiplier != self.multiplier:
+            snapshot.multiplier = self.multiplier
+            changed = True
+        
+        if snapshot.countdown != self.countdown_timer:
+            snapshot.countdown = self.countdown_timer
+            changed = True
+        
+        can_cashout = self.state == GameState.FLYING and self.active_bets.open_count > 0
+        if snapshot.can_cashout != can_cashout:
+            snapshot.can_cashout = can_cashout
+            changed = True
         
-        if self.on_state_change:
-            self.on_state_change(self.state, 0)
+        if changed:
+            snapshot.version += 1
+    
+    def _next_countdown_time(self) -> float:
+        return self._betting_start_time + (BETTING_DURATION - self.countdown_timer + 1)
+    
+    def _start_flying(self, start_time: float):
+        self.state = GameState.FLYING
+        self.multiplier = 1.0
+        self._flying_start_time = start_time
+        self._crash_time = self.time_at_multiplier(self.crash_multiplier)
+        self.liability.build(self.active_bets)
+        self.events.emit(GameEvent.STATE_CHANGE, (self.state, 0))
     
     def _crash(self):
         self.state = GameState.CRASHED
         self.multiplier = self.crash_multiplier
         self.last_results.append(self.crash_multiplier)
+        self.stats.add(self.crash_multiplier)
+        self.settled_bets = list(self.active_bets)
+        self.events.emit(GameEvent.CRASH, self.crash_multiplier)
+        self.events.emit(GameEvent.STATE_CHANGE, (self.state, 0))
+    
+    def _check_auto_cashouts(self, now: float):
+        changed = []
+        while True:
+            target = self.active_bets.next_target()
+            if target is None or target > self.crash_multiplier or self.time_at_multiplier(target) > now:
+                break
+            changed.extend(self.active_bets.pop_triggered(target))
+        
+        for i in changed:
+            bet = self.active_bets[i]
+            winnings = self.active_bets.settle(i, bet.auto_cashout)
+            self.events.emit(GameEvent.AUTO_CASHOUT, winnings)
         
-        if len(self.last_results) > self.max_history:
-            self.last_results.pop(0)
-        
-        if self.on_crash:
-            self.on_crash(self.crash_multiplier)
-        
-        if self.on_state_change:
-            self.on_state_change(self.state, 0)
-    
-    def _check_auto_cashouts(self):
-        for bet in self.active_bets:
-            if not bet.cashed_out and bet.auto_cashout:
-                if self.multiplier >= bet.auto_cashout:
-                    winnings = bet.amount * bet.auto_cashout
-                    bet.cashed_out = True
-                    bet.cashout_multiplier = bet.auto_cashout
-                    
-                    if self.on_auto_cashout:
-                        self.on_auto_cashout(winnings)
+        if changed:
+            self._notify_bets_change(changed)
     
     def _get_status_text(self) -> str:
         if self.state == GameState.WAITING:
@@ -0,0 +1,462 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from game.core.clock import VirtualClock
+from game.core.events import GameEvent
+from game.games.crash import BETTING_DURATION, MULTIPLIER_GROWTH, CrashGame, GameState
+
+
+class RecordKind:
+    ROUND = 1
+    FLIGHT = 2
+    BET = 3
+    CASHOUT = 4
+    CLEAR = 5
+    CRASH = 6
+
+
+FLAG_AUTO = 1
+
+# tipo, flags, reservado, índice da aposta, id do jogador, tempo, valor, extra
+RECORD = struct.Struct('<BBHIIddd')
+INDEX_ENTRY = struct.Struct('<Q')
+INDEX_SUFFIX = '.idx'
+PLAYERS_SUFFIX = '.players'
+
+
+class Record(NamedTuple):
+    kind: int
+    flags: int
+    reserved: int
+    bet: int
+    player: int
+    time: float
+    value: float
+    extra: float
+
+
+class RoundRecorder:
+    """Grava os eventos de cada rodada num log binário de registros fixos.
+    
+    Cada registro tem ``RECORD.size`` bytes. ROUND traz o crash point da
+    rodada, BET o valor e o auto cashout, CASHOUT o multiplicador e o
+    pagamento, CRASH o total pago. O arquivo ``.idx`` guarda o offset do
+    registro ROUND de cada rodada, e o ``.players`` o nome de cada id de
+    jogador (o id 0 é a aposta sem jogador).
+    """
+    
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._log = open(path, 'ab')
+        self._index = open(path + INDEX_SUFFIX, 'a+b')
+        self._players_file = open(path + PLAYERS_SUFFIX, 'a+', encoding='utf-8')
+        self._players_file.seek(0)
+        self._players: Dict[str, int] = {name: i for i, name in enumerate(self._players_file.read().splitlines(), 1)}
+        self._pending = bytearray()
+        self._offset = self._log.tell() if self._log.tell() % RECORD.size == 0 else None
+        self._game = None
+        self._recorded = 0
+        self._cashed = set()
+        self._paid = 0.0
+        
+        if self._offset is None:
+            # Uma gravação interrompida deixou um registro pela metade: descarta o resto
+            size = self._log.tell()
+            self._log.truncate(size - size % RECORD.size)
+            self._offset = self._log.tell()
+        self._repair_index()
+    
+    def attach(self, game):
+        """Passa a gravar ``game``; uma rodada já em andamento é gravada a partir de agora."""
+        self._game = game
+        game.events.subscribe(self._on_game_events, (
+            GameEvent.ROUND_START, GameEvent.STATE_CHANGE, GameEvent.BETS_CHANGE, GameEvent.CRASH,
+        ))
+        if game.state in (GameState.BETTING, GameState.FLYING):
+            self._write_round()
+            if game.state == GameState.FLYING:
+                self._write(RecordKind.FLIGHT, timestamp=game.time_at_multiplier(1.0))
+            self._write_bets(range(len(game.active_bets)))
+    
+    def detach(self):
+        if self._game is not None:
+            self._game.events.unsubscribe(self._on_game_events)
+            self._game = None
+        self.flush()
+    
+    def flush(self):
+        self._drain()
+        self._log.flush()
+        self._index.flush()
+        self._players_file.flush()
+    
+    def close(self):
+        if self._log.closed:
+            return
+        self.detach()
+        self._log.close()
+        self._index.close()
+        self._players_file.close()
+    
+    def _repair_index(self):
+        """Alinha o ``.idx`` ao log: descarta entradas pela metade ou além do fim e indexa rodadas faltando."""
+        index = self._index
+        size = index.seek(0, os.SEEK_END)
+        count = size // INDEX_ENTRY.size
+        last = None
+        while count:
+            index.seek((count - 1) * INDEX_ENTRY.size)
+            last = INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))[0]
+            if last < self._offset and last % RECORD.size == 0:
+                break
+            count -= 1
+            last = None
+        
+        start = 0 if last is None else last + RECORD.size
+        with open(self.path, 'rb') as log:
+            log.seek(start)
+            kinds = log.read(self._offset - start)[::RECORD.size]
+        missing = [start + i * RECORD.size for i, kind in enumerate(kinds) if kind == RecordKind.ROUND]
+        if count * INDEX_ENTRY.size != size:
+            index.truncate(count * INDEX_ENTRY.size)
+        if missing:
+            index.write(b''.join(map(INDEX_ENTRY.pack, missing)))
+            index.flush()
+    
+    def _on_game_events(self, events):
+        game = self._game
+        for name, payload in events:
+            if name == GameEvent.ROUND_START:
+                self._write_round()
+            elif name == GameEvent.STATE_CHANGE and payload[0] == GameState.FLYING:
+                self._write(RecordKind.FLIGHT, timestamp=game.time_at_multiplier(1.0))
+            elif name == GameEvent.BETS_CHANGE:
+                if payload is None:
+                    if self._recorded and not game.active_bets:
+                        self._write(RecordKind.CLEAR)
+                        self._reset_round()
+                else:
+                    self._write_bets(payload)
+            elif name == GameEvent.CRASH:
+                self._write_crash(payload)
+    
+    def _write_round(self):
+        self._reset_round()
+        self._index.write(INDEX_ENTRY.pack(self._offset + len(self._pending)))
+        self._write(RecordKind.ROUND, timestamp=self._game.betting_started_at(), value=self._game.crash_multiplier)
+    
+    def _reset_round(self):
+        self._recorded = 0
+        self._cashed.clear()
+        self._paid = 0.0
+    
+    def _write_bets(self, indices):
+        bets = self._game.active_bets
+        for index in range(self._recorded, len(bets)):
+            bet = bets[index]
+            self._write(RecordKind.BET, bet=index, player=self._player_id(bet.player),
+                        value=bet.amount, extra=bet.auto_cashout or 0.0)
+        self._recorded = max(self._recorded, len(bets))
+        
+        for index in sorted(indices):
+            bet = bets[index]
+            if bet.cashed_out and index not in self._cashed:
+                self._cashed.add(index)
+                payout = bet.amount * bet.cashout_multiplier
+                self._paid += payout
+                auto = bet.auto_cashout is not None and bet.cashout_multiplier == bet.auto_cashout
+                # Um flush pode juntar vários prazos: o tempo do registro é o do saque, não o de agora
+                self._write(RecordKind.CASHOUT, FLAG_AUTO if auto else 0, index, self._player_id(bet.player),
+                            self._game.time_at_multiplier(bet.cashout_multiplier), bet.cashout_multiplier, payout)
+    
+    def _write_crash(self, crash_point: float):
+        self._write(RecordKind.CRASH, timestamp=self._game.time_at_multiplier(crash_point),
+                    value=crash_point, extra=self._paid)
+        self._reset_round()
+        self.flush()
+    
+    def _write(self, kind: int, flags: int = 0, bet: int = 0, player: int = 0,
+               timestamp: Optional[float] = None, value: float = 0.0, extra: float = 0.0):
+        if timestamp is None:
+            timestamp = self._game.clock.now()
+        self._pending += RECORD.pack(kind, flags, 0, bet, player, timestamp, value, extra)
+        if len(self._pending) >= 64 * RECORD.size:
+            self._drain()
+    
+    def _drain(self):
+        if self._pending:
+            self._offset += len(self._pending)
+            self._log.write(self._pending)
+            self._pending.clear()
+    
+    def _player_id(self, player: Optional[str]) -> int:
+        if player is None:
+            return 0
+        player_id = self._players.get(player)
+        if player_id is None:
+            player_id = self._players[player] = len(self._players) + 1
+            self._players_file.write(player + '\n')
+        return player_id
+
+
+def read_players(path: str) -> List[Optional[str]]:
+    """Nomes por id de jogador; o id 0 é ``None``."""
+    players: List[Optional[str]] = [None]
+    if os.path.exists(path + PLAYERS_SUFFIX):
+        with open(path + PLAYERS_SUFFIX, encoding='utf-8') as f:
+            players.extend(f.read().splitlines())
+    return players
+
+
+class RoundLog:
+    """Leitura de um log de rodadas mapeado em memória.
+    
+    ``round_view`` devolve uma fatia do mapa sem cópia; o índice ``.idx``
+    dá acesso direto a qualquer rodada e é reconstruído por varredura se
+    estiver ausente, corrompido ou atrás do log.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.players = read_players(path)
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self.size = size - size % RECORD.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._view = memoryview(self._map)[:self.size] if self._map else memoryview(b'')
+        self._offsets = self._load_index()
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def record_count(self) -> int:
+        return self.size // RECORD.size
+    
+    def round_view(self, index: int) -> memoryview:
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self.size
+        return self._view[start:end]
+    
+    def records(self, index: int) -> Iterator[Record]:
+        return map(Record._make, RECORD.iter_unpack(self.round_view(index)))
+    
+    def crash_point(self, index: int) -> float:
+        return RECORD.unpack_from(self._view, self._offsets[index])[6]
+    
+    def crash_points(self) -> List[float]:
+        return [self.crash_point(i) for i in range(len(self._offsets))]
+    
+    def close(self):
+        self._offsets = []
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+    
+    def _load_index(self):
+        index_path = self.path + INDEX_SUFFIX
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                data = f.read()
+            # Uma entrada pela metade no fim vem de uma gravação interrompida
+            offsets = memoryview(data)[:len(data) - len(data) % INDEX_ENTRY.size].cast('Q')
+            count = len(offsets)
+            while count and offsets[count - 1] >= self.size:
+                count -= 1
+            if count and self._index_matches(offsets[:count]):
+                return offsets[:count]
+        
+        kinds = self._view.tobytes()[::RECORD.size]
+        return [i * RECORD.size for i, kind in enumerate(kinds) if kind == RecordKind.ROUND]
+    
+    def _index_matches(self, offsets) -> bool:
+        view = self._view
+        previous = -1
+        for offset in offsets:
+            if offset <= previous or offset % RECORD.size or view[offset] != RecordKind.ROUND:
+                return False
+            previous = offset
+        # Nenhuma rodada depois da última indexada: o índice não ficou atrás do log
+        return RecordKind.ROUND not in view[previous + RECORD.size:].tobytes()[::RECORD.size]
+
+
+class Replayer:
+    """Reproduz as rodadas gravadas num ``CrashGame``.
+    
+    O jogo recebe o crash point gravado via ``crash_source``; apostas e
+    cancelamentos entram no mesmo tempo relativo ao início da rodada, e
+    saques manuais no instante em que o voo atinge o multiplicador gravado.
+    Auto cashouts e o crash acontecem pelo próprio jogo. Com relógio virtual
+    (``run``) o replay é exato, e rodadas cujo total pago difere da gravação
+    vão para ``mismatches``; com um relógio real (ou ``ScaledClock``) quem
+    chama ``pump`` define o ritmo.
+    """
+    
+    def __init__(self, log: RoundLog, game: Optional[CrashGame] = None, first_round: int = 0,
+                 last_round: Optional[int] = None, intermission: float = 2.0):
+        self.log = log
+        self.game = game or CrashGame(clock=VirtualClock())
+        self.game.crash_source = self._next_crash_point
+        self.game.auto_restart = False
+        self.intermission = intermission
+        self.round = first_round
+        self.last_round = len(log) if last_round is None else min(last_round, len(log))
+        self.rounds_replayed = 0
+        self.mismatches: List[int] = []
+        self._actions: List[tuple] = []
+        self._crash_point = 1.0
+        self._current: Optional[int] = None
+        self._expected_paid: Optional[float] = None
+        self.game.events.subscribe(self._on_game_events, (GameEvent.CRASH,))
+    
+    def seek(self, round_index: int):
+        """A próxima rodada iniciada será ``round_index``; a rodada em andamento segue até o crash."""
+        self.round = round_index
+        self._actions.clear()
+    
+    def next_due(self) -> Optional[float]:
+        if self._actions:
+            return self._actions[-1][0]
+        if self.round >= self.last_round:
+            return None
+        
+        game = self.game
+        if game.state == GameState.WAITING:
+            return game.clock.now()
+        if game.state == GameState.CRASHED:
+            return game.time_at_multiplier(game.crash_multiplier) + self.intermission
+        return None
+    
+    def pump(self, now: Optional[float] = None) -> Optional[float]:
+        """Aplica tudo que venceu até ``now`` e devolve o próximo vencimento."""
+        if now is None:
+            now = self.game.clock.now()
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                return due
+            if self._actions:
+                self._apply(self._actions.pop())
+            else:
+                self._start_round()
+    
+    def run(self) -> int:
+        """Reproduz o restante do log com relógio virtual, na velocidade máxima."""
+        game = self.game
+        while True:
+            pending = [t for t in (self.next_due(), game.next_deadline()) if t is not None]
+            if not pending:
+                return self.rounds_replayed
+            game.clock.advance_to(min(pending))
+            game.advance()
+            self.pump()
+    
+    def _next_crash_point(self) -> float:
+        return self._crash_point
+    
+    def _start_round(self):
+        records = list(self.log.records(self.round))
+        opening = records[0]
+        self._current = self.round
+        self._crash_point = opening.value
+        self._expected_paid = None
+        self.round += 1
+        
+        game = self.game
+        game.start_new_round()
+        start = game.clock.now()
+        actions = []
+        for seq, record in enumerate(records[1:]):
+            if record.kind in (RecordKind.BET, RecordKind.CLEAR):
+                offset = min(max(0.0, record.time - opening.time), BETTING_DURATION * (1 - 1e-9))
+                actions.append((start + offset, seq, record))
+            elif record.kind == RecordKind.CASHOUT and not record.flags & FLAG_AUTO:
+                due = start + BETTING_DURATION + (record.value - 1.0) / MULTIPLIER_GROWTH
+                actions.append((due, seq, record))
+            elif record.kind == RecordKind.CRASH:
+                self._expected_paid = record.extra
+        actions.sort(reverse=True)
+        self._actions = actions
+    
+    def _apply(self, action: tuple):
+        due, _, record = action
+        game = self.game
+        player = self.log.players[record.player] if record.player < len(self.log.players) else None
+        if record.kind == RecordKind.BET:
+            game.add_bet(record.value, record.extra or None, player=player)
+        elif record.kind == RecordKind.CLEAR:
+            game.clear_bets()
+        elif record.kind == RecordKind.CASHOUT:
+            if isinstance(game.clock, VirtualClock):
+                game.clock.advance_to(due)
+            game.cashout_all(player=player)
+    
+    def _on_game_events(self, events):
+        if self._current is None:
+            return
+        
+        bets = self.game.active_bets
+        paid = sum(bets[i].amount * bets[i].cashout_multiplier for i in range(len(bets)) if bets[i].cashed_out)
+        expected = self._expected_paid
+        if expected is not None and abs(paid - expected) > 1e-6 * max(1.0, expected):
+            self.mismatches.append(self._current)
+        self.rounds_replayed += 1
+        self._current = None
+
+
+def _format_record(record: Record, players: List[Optional[str]]) -> str:
+    kind = {value: name for name, value in vars(RecordKind).items() if not name.startswith('_')}[record.kind]
+    player = players[record.player] if record.player < len(players) else f'#{record.player}'
+    if record.kind == RecordKind.ROUND:
+        return f'{record.time:14.3f}  {kind:<8} crash {record.value:.2f}x'
+    if record.kind == RecordKind.BET:
+        auto = f' auto {record.extra:.2f}x' if record.extra else ''
+        return f'{record.time:14.3f}  {kind:<8} #{record.bet} {player or "-"} R$ {record.value:.2f}{auto}'
+    if record.kind == RecordKind.CASHOUT:
+        mode = 'auto' if record.flags & FLAG_AUTO else 'manual'
+        return (f'{record.time:14.3f}  {kind:<8} #{record.bet} {player or "-"} {record.value:.2f}x '
+                f'R$ {record.extra:.2f} ({mode})')
+    if record.kind == RecordKind.CRASH:
+        return f'{record.time:14.3f}  {kind:<8} {record.value:.2f}x, pago R$ {record.extra:.2f}'
+    return f'{record.time:14.3f}  {kind}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspeciona e reproduz um log de rodadas do Crash.')
+    parser.add_argument('path')
+    parser.add_argument('--round', type=int, action='append', help='mostra os registros da rodada (negativo conta do fim)')
+    parser.add_argument('--verify', action='store_true', help='reproduz o log com relógio virtual e compara os pagamentos')
+    args = parser.parse_args()
+    
+    with RoundLog(args.path) as log:
+        print(f'{len(log)} rodadas, {log.record_count} registros ({log.size / 1024:.1f} KiB)')
+        for index in args.round or []:
+            index %= len(log)
+            print(f'Rodada {index}:')
+            for record in log.records(index):
+                print('  ' + _format_record(record, log.players))
+        
+        if args.verify:
+            replayer = Replayer(log)
+            started = time.perf_counter()
+            replayer.run()
+            elapsed = time.perf_counter() - started
+            print(f'{replayer.rounds_replayed} rodadas reproduzidas em {elapsed:.2f}s; '
+                  f'{len(replayer.mismatches)} com pagamento diferente do gravado {replayer.mismatches[:20]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+from game.core.clock import SteppedClock
+from game.games.crash import CrashGame, GameState
+
+
+class CrashSimulator:
+    
+    def __init__(self, game: Optional[CrashGame] = None, step: Optional[float] = None,
+                 intermission: float = 2.0, seed: Optional[int] = None):
+        self.step = step
+        self.clock = SteppedClock(step or 0.0)
+        self.game = game or CrashGame(clock=self.clock, rng=random.Random(seed))
+        self.game.clock = self.clock
+        self.intermission = intermission
+        self.rounds_played = 0
+    
+    def run_round(self) -> float:
+        game = self.game
+        game.start_new_round()
+        
+        while game.state != GameState.CRASHED:
+            if self.step:
+                game.update(self.clock.tick())
+            else:
+                self.clock.advance_to(game.next_deadline())
+                game.update(0)
+        
+        self.rounds_played += 1
+        self.clock.advance(self.intermission)
+        return game.crash_multiplier
+    
+    def run(self, rounds: int, on_round: Optional[Callable] = None) -> List[float]:
+        results = []
+        for _ in range(rounds):
+            crash_point = self.run_round()
+            results.append(crash_point)
+            if on_round:
+                on_round(self.game)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simula rodadas do Crash sem interface.')
+    parser.add_argument('--rounds', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--step', type=float, default=None,
+                        help='passo fixo em segundos (padrão: saltar direto para o próximo evento)')
+    parser.add_argument('--record', help='grava as rodadas num log binário (ver game.games.crash_log)')
+    parser.add_argument('--history', help='grava rodadas e apostas num banco SQLite (ver game.core.history_store)')
+    args = parser.parse_args()
+    
+    simulator = CrashSimulator(step=args.step, seed=args.seed)
+    recorder = None
+    if args.record:
+        from game.games.crash_log import RoundRecorder
+        recorder = RoundRecorder(args.record)
+        recorder.attach(simulator.game)
+    history_store = None
+    if args.history:
+        from game.core.history_store import HistoryStore
+        history_store = HistoryStore(args.history)
+        history_store.attach(simulator.game)
+    started = time.perf_counter()
+    results = simulator.run(args.rounds)
+    elapsed = time.perf_counter() - started
+    if recorder is not None:
+        recorder.close()
+    if history_store is not None:
+        history_store.close()
+    
+    print(f'{len(results)} rodadas em {elapsed:.2f}s ({len(results) / elapsed:.0f} rodadas/s)')
+    print(f'Tempo simulado: {simulator.clock.now():.0f}s')
+    
+    stats = simulator.game.stats
+    print(stats.summary())
+    for label, frequency in zip(stats.band_labels(), stats.band_frequencies()):
+        print(f'  {label:<14} {frequency:>7.2%}')
+    print(f'Maior sequência abaixo de {stats.streak_threshold:.1f}x: {stats.longest_below} · acima: {stats.longest_above}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Net package - Servidor local e cliente do Crash via asyncio
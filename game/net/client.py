@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Optional
+from game.net.protocol import MAX_LINE_LENGTH, decode, encode
+
+
+class CrashClient:
+    """Cliente do servidor do Crash.
+    
+    O servidor só envia os parâmetros da curva no início do voo; o
+    multiplicador corrente é calculado localmente a partir deles.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765):
+        self.host = host
+        self.port = port
+        self.player = None
+        self.balance = 0.0
+        self.state = None
+        self.crash_point = None
+        self.results = []
+        self.on_message = None
+        self._reader = None
+        self._writer = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listener = None
+        self._flight_origin = None
+        self._base = 1.0
+        self._growth = 0.0
+        self._ready = None
+    
+    async def connect(self):
+        self._ready = asyncio.get_running_loop().create_future()
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE_LENGTH)
+        self._listener = asyncio.create_task(self._listen())
+        await self._ready
+    
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+        if self._writer:
+            self._writer.close()
+    
+    @property
+    def multiplier(self) -> float:
+        if self.state != 'FLYING' or self._flight_origin is None:
+            return self.crash_point if self.state == 'CRASHED' else 1.0
+        return self._base + (time.monotonic() - self._flight_origin) * self._growth
+    
+    async def bet(self, amount: float, auto_cashout: Optional[float] = None) -> dict:
+        return await self._request({'type': 'bet', 'amount': amount, 'auto_cashout': auto_cashout})
+    
+    async def bets(self, bets) -> dict:
+        return await self._request({'type': 'bets', 'bets': [list(bet) for bet in bets]})
+    
+    async def cashout(self) -> dict:
+        return await self._request({'type': 'cashout'})
+    
+    async def refresh(self) -> dict:
+        return await self._request({'type': 'state'})
+    
+    async def _request(self, message: dict) -> dict:
+        request_id = next(self._ids)
+        message['id'] = request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode(message))
+        await self._writer.drain()
+        return await future
+    
+    async def _listen(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                self._handle(decode(line))
+        finally:
+            if not self._ready.done():
+                self._ready.set_exception(ConnectionError('conexão encerrada antes do estado inicial'))
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('conexão encerrada'))
+            self._pending.clear()
+    
+    def _handle(self, message: dict):
+        kind = message.get('type')
+        
+        if kind in ('state', 'round'):
+            self.state = message.get('state', self.state)
+            if 'elapsed' in message:
+                self._flight_origin = time.monotonic() - message['elapsed']
+                self._base = message['base']
+                self._growth = message['growth']
+            if kind == 'state':
+                self.player = message['player']
+                self.results = message['results']
+                if not self._ready.done():
+                    self._ready.set_result(None)
+        elif kind == 'crash':
+            self.state = 'CRASHED'
+            self.crash_point = message['crash_point']
+            self._flight_origin = None
+            self.results.insert(0, self.crash_point)
+        
+        if 'balance' in message:
+            self.balance = message['balance']
+        
+        future = self._pending.pop(message.get('id'), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+        
+        if self.on_message:
+            self.on_message(message)
+
+
+async def _run_clients(args):
+    clients = [CrashClient(args.host, args.port) for _ in range(args.clients)]
+    await asyncio.gather(*(client.connect() for client in clients))
+    print(f'{len(clients)} clientes conectados')
+    
+    watcher = clients[0]
+    watcher.on_message = lambda message: print(message) if message['type'] in ('round', 'crash', 'settled') else None
+    
+    try:
+        while True:
+            if watcher.state == 'BETTING' and args.bet:
+                await asyncio.gather(*(client.bet(args.bet, args.auto_cashout) for client in clients))
+                while watcher.state == 'BETTING':
+                    await asyncio.sleep(0.1)
+            await asyncio.sleep(0.1)
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cliente do servidor do Crash.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=1, help='número de conexões simultâneas')
+    parser.add_argument('--bet', type=float, default=0.0, help='aposta por cliente a cada rodada')
+    parser.add_argument('--auto-cashout', type=float, default=None)
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(_run_clients(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import json
+
+
+MAX_LINE_LENGTH = 4096
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def decode(line: bytes) -> dict:
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError('message must be a JSON object')
+    return message
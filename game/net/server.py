@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import itertools
+from typing import Dict, Optional
+from game.core.accounts import AccountStore
+from game.core.events import GameEvent
+from game.games.crash import CrashGame, GameState, MULTIPLIER_GROWTH
+from game.net.protocol import MAX_LINE_LENGTH, decode, encode
+
+
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+class ClientSession:
+    __slots__ = ('client_id', 'player', 'reader', 'writer')
+    
+    def __init__(self, client_id: int, reader, writer):
+        self.client_id = client_id
+        self.player = f'player-{client_id}'
+        self.reader = reader
+        self.writer = writer
+
+
+class CrashServer:
+    
+    def __init__(self, game: Optional[CrashGame] = None, host: str = '127.0.0.1', port: int = 8765,
+                 accounts: Optional[AccountStore] = None, max_write_buffer: int = MAX_WRITE_BUFFER):
+        self.game = game or CrashGame(auto_restart=True)
+        self.accounts = accounts or AccountStore()
+        self.host = host
+        self.port = port
+        self.max_write_buffer = max_write_buffer
+        self.clients: Dict[int, ClientSession] = {}
+        self._players: Dict[str, ClientSession] = {}
+        self._settled = set()
+        self._round_bets: Optional[list] = None
+        self._ids = itertools.count(1)
+        self._server = None
+        self._game_task = None
+        self._wake: Optional[asyncio.Event] = None
+    
+    async def start(self):
+        self._wake = asyncio.Event()
+        self.game.events.subscribe(self._on_game_events)
+        if self.game.state == GameState.WAITING:
+            self.game.start_new_round()
+        elif self.game.state == GameState.FLYING:
+            self._round_bets = list(self.game.active_bets)
+        
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_LINE_LENGTH)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._game_task = asyncio.create_task(self._run_game())
+    
+    async def stop(self):
+        if self._game_task:
+            self._game_task.cancel()
+        for session in list(self.clients.values()):
+            self._drop(session)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        # Dá aos handlers a chance de ver o EOF antes do loop encerrar
+        await asyncio.sleep(0)
+        self.game.events.unsubscribe(self._on_game_events)
+    
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def _run_game(self):
+        while True:
+            now = self.game.clock.now()
+            deadline = self.game.next_deadline()
+            while deadline is not None and deadline <= now:
+                # Um prazo por vez: cada flush entrega só os eventos daquele passo
+                self.game.advance(deadline)
+                deadline = self.game.next_deadline()
+            
+            self._wake.clear()
+            timeout = None if deadline is None else deadline - now
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _handle_client(self, reader, writer):
+        session = ClientSession(next(self._ids), reader, writer)
+        self.accounts.open(session.player)
+        self.clients[session.client_id] = session
+        self._players[session.player] = session
+        self._send(session, self._welcome(session))
+        
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode(line)
+                except ValueError:
+                    self._send(session, {'type': 'error', 'reason': 'invalid_message'})
+                    continue
+                self._handle_message(session, message)
+        except (asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            self._drop(session)
+    
+    def _handle_message(self, session: ClientSession, message: dict):
+        kind = message.get('type')
+        request_id = message.get('id')
+        
+        if kind == 'bet':
+            reply = self._place_bet(session, message)
+        elif kind == 'bets':
+            reply = self._place_bets(session, message)
+        elif kind == 'cashout':
+            reply = self._cashout(session)
+        elif kind == 'state':
+            reply = self._welcome(session)
+        else:
+            reply = {'type': 'error', 'reason': 'unknown_type'}
+        
+        if request_id is not None:
+            reply['id'] = request_id
+        self._send(session, reply)
+    
+    def _place_bet(self, session: ClientSession, message: dict) -> dict:
+        try:
+            amount = float(message['amount'])
+            auto_cashout = message.get('auto_cashout')
+            auto_cashout = float(auto_cashout) if auto_cashout is not None else None
+        except (KeyError, TypeError, ValueError):
+            return {'type': 'error', 'reason': 'invalid_bet'}
+        
+        if not self.game.valid_bets([(amount, auto_cashout)]):
+            return {'type': 'error', 'reason': 'invalid_bet'}
+        if not self.accounts.reserve(session.player, amount):
+            return {'type': 'error', 'reason': 'insufficient_balance'}
+        if not self.game.add_bet(amount, auto_cashout, player=session.player):
+            self.accounts.refund(session.player, amount)
+            return {'type': 'error', 'reason': 'betting_closed'}
+        
+        return {'type': 'bet_ok', 'bet': len(self.game.active_bets) - 1, 'balance': self.accounts.balance(session.player)}
+    
+    def _place_bets(self, session: ClientSession, message: dict) -> dict:
+        try:
+            bets = [(float(amount), None if auto_cashout is None else float(auto_cashout))
+                    for amount, auto_cashout in message['bets']]
+        except (KeyError, TypeError, ValueError):
+            return {'type': 'error', 'reason': 'invalid_bet'}
+        
+        total = sum(amount for amount, _ in bets)
+        if not self.game.valid_bets(bets):
+            return {'type': 'error', 'reason': 'invalid_bet'}
+        if not self.game.can_bet():
+            return {'type': 'error', 'reason': 'betting_closed'}
+        if not self.accounts.reserve(session.player, total):
+            return {'type': 'error', 'reason': 'insufficient_balance'}
+        if not self.game.add_bets(bets, player=session.player):
+            self.accounts.refund(session.player, total)
+            return {'type': 'error', 'reason': 'betting_closed'}
+        
+        first = len(self.game.active_bets) - len(bets)
+        return {'type': 'bets_ok', 'bets': [first, len(bets)], 'balance': self.accounts.balance(session.player)}
+    
+    def _cashout(self, session: ClientSession) -> dict:
+        payout = self.game.cashout_all(player=session.player)
+        if payout <= 0:
+            return {'type': 'error', 'reason': 'nothing_to_cashout'}
+        return {'type': 'cashout_ok', 'payout': payout, 'multiplier': self.game.multiplier,
+                'balance': self.accounts.balance(session.player)}
+    
+    def _welcome(self, session: ClientSession) -> dict:
+        message = {
+            'type': 'state',
+            'player': session.player,
+            'balance': self.accounts.balance(session.player),
+            'state': self.game.state,
+            'results': self.game.last_results.newest(self.game.max_history),
+        }
+        message.update(self._round_params())
+        return message
+    
+    def _round_params(self) -> dict:
+        now = self.game.clock.now()
+        if self.game.state == GameState.BETTING:
+            return {'betting_ends_in': max(0.0, self.game.next_deadline() - now) + self.game.countdown_timer - 1}
+        if self.game.state == GameState.FLYING:
+            return {'elapsed': now - self.game.time_at_multiplier(1.0), 'base': 1.0, 'growth': MULTIPLIER_GROWTH}
+        return {}
+    
+    def _on_game_events(self, events):
+        # Índices se referem ao livro da rodada; ``None`` (livro inteiro) vira todos eles
+        settled = set()
+        everything = False
+        for name, payload in events:
+            if name == GameEvent.ROUND_START:
+                self._settled.clear()
+                self._round_bets = None
+                self._broadcast(dict({'type': 'round', 'state': GameState.BETTING}, **self._round_params()))
+            elif name == GameEvent.STATE_CHANGE and payload[0] == GameState.FLYING:
+                # Fechadas as apostas, a liquidação usa esta cópia e não o livro vivo
+                self._round_bets = list(self.game.active_bets)
+                self._broadcast(dict({'type': 'round', 'state': GameState.FLYING}, **self._round_params()))
+            elif name == GameEvent.BETS_CHANGE:
+                if payload is None:
+                    everything = True
+                else:
+                    settled.update(payload)
+            elif name == GameEvent.CRASH:
+                bets = self._round_bets or []
+                self._report_settlements(bets, range(len(bets)) if everything else settled)
+                self._settle_losses(bets)
+                settled.clear()
+                everything = False
+                self._round_bets = None
+                self._broadcast({'type': 'crash', 'crash_point': payload})
+        
+        if self._round_bets is not None and (settled or everything):
+            self._report_settlements(self._round_bets, range(len(self._round_bets)) if everything else settled)
+        if self._wake is not None:
+            self._wake.set()
+    
+    def _report_settlements(self, bets, indices):
+        for index in sorted(indices):
+            bet = bets[index]
+            if not bet.cashed_out or bet.player is None or index in self._settled:
+                continue
+            
+            self._settled.add(index)
+            payout = bet.amount * bet.cashout_multiplier
+            balance = self.accounts.commit(bet.player, bet.amount, payout)
+            session = self._players.get(bet.player)
+            if session is not None:
+                self._send(session, {
+                    'type': 'settled',
+                    'bet': index,
+                    'multiplier': bet.cashout_multiplier,
+                    'payout': payout,
+                    'balance': balance,
+                })
+    
+    def _settle_losses(self, bets):
+        for bet in bets:
+            if not bet.cashed_out and bet.player is not None:
+                self.accounts.commit(bet.player, bet.amount)
+    
+    def _broadcast(self, message: dict):
+        data = encode(message)
+        for session in list(self.clients.values()):
+            self._write(session, data)
+    
+    def _send(self, session: ClientSession, message: dict):
+        self._write(session, encode(message))
+    
+    def _write(self, session: ClientSession, data: bytes):
+        transport = session.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > self.max_write_buffer:
+            transport.abort()
+            self._drop(session)
+            return
+        session.writer.write(data)
+    
+    def _drop(self, session: ClientSession):
+        if self.clients.pop(session.client_id, None) is None:
+            return
+        self._players.pop(session.player, None)
+        session.writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local do Crash (JSON por linha sobre TCP).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--record', help='grava as rodadas num log binário (ver game.games.crash_log)')
+    parser.add_argument('--history', help='grava rodadas e apostas num banco SQLite (ver game.core.history_store)')
+    args = parser.parse_args()
+    
+    server = CrashServer(host=args.host, port=args.port)
+    recorder = None
+    if args.record:
+        from game.games.crash_log import RoundRecorder
+        recorder = RoundRecorder(args.record)
+        recorder.attach(server.game)
+    history_store = None
+    if args.history:
+        from game.core.history_store import HistoryStore
+        history_store = HistoryStore(args.history)
+        history_store.attach(server.game)
+    print(f'Servidor do Crash em {args.host}:{args.port}')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder:
+            recorder.close()
+        if history_store is not None:
+            history_store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import os
+import zlib
+from collections import OrderedDict
+from typing import List
+from kivy.atlas import Atlas
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import Texture
+
+
+AVATAR_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+AVATAR_SIZE = 40
+PLACEHOLDER_COLORS = [
+    (46, 204, 113), (52, 152, 219), (155, 89, 182), (241, 196, 15),
+    (230, 126, 34), (231, 76, 60), (26, 188, 156), (149, 165, 166),
+]
+
+
+class AvatarProvider:
+    
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self._sources: List[str] = []
+        self._atlas_textures = {}
+        self._textures = OrderedDict()
+    
+    def seed_from_directory(self, directory: str):
+        if not os.path.isdir(directory):
+            return
+        for filename in sorted(os.listdir(directory)):
+            if filename.lower().endswith(AVATAR_EXTENSIONS):
+                self._sources.append(os.path.join(directory, filename))
+    
+    def seed_from_atlas(self, atlas_path: str):
+        atlas = Atlas(atlas_path)
+        for name in sorted(atlas.textures):
+            source = f'atlas://{atlas_path}/{name}'
+            self._atlas_textures[source] = atlas.textures[name]
+            self._sources.append(source)
+    
+    def get(self, key: str) -> Texture:
+        checksum = zlib.crc32(key.encode('utf-8'))
+        if self._sources:
+            source = self._sources[checksum % len(self._sources)]
+        else:
+            source = f'placeholder:{checksum % len(PLACEHOLDER_COLORS)}'
+        
+        texture = self._textures.get(source)
+        if texture is not None:
+            self._textures.move_to_end(source)
+            return texture
+        
+        texture = self._load(source)
+        self._textures[source] = texture
+        if len(self._textures) > self.capacity:
+            self._textures.popitem(last=False)
+        return texture
+    
+    def _load(self, source: str) -> Texture:
+        if source in self._atlas_textures:
+            return self._atlas_textures[source]
+        
+        if source.startswith('placeholder:'):
+            color = PLACEHOLDER_COLORS[int(source.split(':', 1)[1])]
+            texture = Texture.create(size=(AVATAR_SIZE, AVATAR_SIZE), colorfmt='rgb')
+            texture.blit_buffer(bytes(color) * (AVATAR_SIZE * AVATAR_SIZE), colorfmt='rgb', bufferfmt='ubyte')
+            return texture
+        
+        return CoreImage(source).texture
+
+
+avatar_provider = AvatarProvider()
@@ -2,9 +2,11 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.snackbar import MDSnackbar
+from kivy.clock import Clock
+from kivy.factory import Factory
 from kivy.properties import StringProperty, NumericProperty, ListProperty
-from kivy.uix.image import AsyncImage
-import random
+from kivy.uix.image import Image
+from game.ui.avatars import avatar_provider
 
 
 def show_snackbar(text):
@@ -108,45 +110,70 @@ class WinnerItem(MDBoxLayout):
         self.bind(multiplier=self.update_multiplier)
 
     def create_avatar(self):
-        try:
-            avatar_urls = [
-                f"https://i.pravatar.cc/40?img={random.randint(1, 70)}",
-                f"https://robohash.org/{random.randint(1, 1000)}.png?set=set1&size=40x40",
-                f"https://robohash.org/{random.randint(1, 1000)}.png?set=set2&size=40x40"
-            ]
-
-            avatar = AsyncImage(
-                source=random.choice(avatar_urls),
-                size_hint=(None, None),
-                size=('40dp', '40dp'),
-                allow_stretch=True,
-                keep_ratio=True
-            )
-            return avatar
-
-        except Exception:
-            return MDLabel(
-                text=self.name[0].upper() if self.name else 'A',
-                theme_text_color='Custom',
-                text_color=[0.2, 0.8, 0.4, 1],
-                font_size='16sp',
-                halign='center',
-                valign='center',
-                size_hint=(None, None),
-                size=('40dp', '40dp'),
-                bold=True
-            )
+        return Image(
+            texture=avatar_provider.get(self.name),
+            size_hint=(None, None),
+            size=('40dp', '40dp'),
+            fit_mode='contain'
+        )
 
     def format_currency_br(self, value):
         return f"R$ {value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
 
     def update_name(self, instance, value):
         self.name_label.text = value
-        if hasattr(self.avatar_widget, 'text'):
-            self.avatar_widget.text = value[0].upper() if value else 'A'
+        self.avatar_widget.texture = avatar_provider.get(value)
 
     def update_amount(self, instance, value):
         self.amount_label.text = f'ganhou {self.format_currency_br(value)} em {self.multiplier:.1f}x'
 
     def update_multiplier(self, instance, value):
         self.amount_label.text = f'ganhou {self.format_currency_br(self.amount)} em {value:.1f}x'
+
+
+class WidgetPool:
+
+    def __init__(self, factory, size=0):
+        self._factory = factory
+        self._free = [factory() for _ in range(size)]
+
+    def acquire(self, **properties):
+        widget = self._free.pop() if self._free else self._factory()
+        for name, value in properties.items():
+            setattr(widget, name, value)
+        return widget
+
+    def release(self, widget):
+        if widget.parent:
+            widget.parent.remove_widget(widget)
+        self._free.append(widget)
+
+
+def prefill_recycleview(recycleview, count):
+    """Cria antecipadamente ``count`` views da RecycleView, uma por passo do gerador."""
+    viewclass = recycleview.viewclass
+    if isinstance(viewclass, str):
+        viewclass = Factory.get(viewclass)
+    # dirty_views é estado interno do RecycleDataAdapter (conferido no Kivy 2.3.1, fixado em
+    # requirements.txt): get_view procura ali primeiro, e as linhas vazias não aparecem na tela.
+    # Se outra versão mudar essa estrutura, o aquecimento é pulado
+    dirty_views = getattr(recycleview.view_adapter, 'dirty_views', None)
+    if not isinstance(dirty_views, dict):
+        return
+    dirty_views = dirty_views[viewclass]
+    for index in range(count):
+        if index not in dirty_views:
+            dirty_views[index] = viewclass()
+            yield
+
+
+def run_in_frames(steps, on_done=None):
+    """Consome um passo do gerador ``steps`` por frame, para não travar a tela."""
+    def step(dt):
+        try:
+            next(steps)
+        except StopIteration:
+            if on_done:
+                on_done()
+            return False
+    return Clock.schedule_interval(step, 0)
@@ -0,0 +1,49 @@
+from kivy.clock import Clock
+from game.core.table_engine import TableEngine
+
+
+_drivers = {}
+
+
+class ClockEngineDriver:
+
+    def __init__(self, engine: TableEngine):
+        self.engine = engine
+        self._event = Clock.create_trigger(self._tick, 0)
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.engine.on_schedule = self._on_schedule
+        self._tick(0)
+
+    def stop(self):
+        self._running = False
+        self.engine.on_schedule = None
+        self._event.cancel()
+
+    def _on_schedule(self, deadline):
+        self._arm(deadline)
+
+    def _tick(self, dt):
+        self.engine.tick()
+        deadline = self.engine.next_deadline()
+        if deadline is not None:
+            self._arm(deadline)
+
+    def _arm(self, deadline):
+        if not self._running:
+            return
+        self._event.cancel()
+        clock = self.engine.clock
+        self._event.timeout = max(0.0, deadline - clock.now()) / getattr(clock, 'speed', 1.0)
+        self._event()
+
+
+def get_engine_driver(engine: TableEngine) -> ClockEngineDriver:
+    driver = _drivers.get(id(engine))
+    if driver is None:
+        driver = _drivers[id(engine)] = ClockEngineDriver(engine)
+    return driver
@@ -0,0 +1,112 @@
+import copyreg
+import glob
+import hashlib
+import importlib.util
+import io
+import marshal
+import os
+import pickle
+import types
+from functools import partial
+import kivy
+from kivy.factory import Factory
+from kivy.lang import Builder, Parser
+from kivy.logger import Logger
+from kivy.resources import resource_find
+
+
+class _ParserPickler(pickle.Pickler):
+    # As regras guardam código compilado; marshal serializa code objects
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[types.CodeType] = lambda code: (marshal.loads, (marshal.dumps(code),))
+
+
+def _digest(source: str, filename: str) -> str:
+    # As regras guardam o nome do arquivo; ele entra na chave para o cache casar com unload_file
+    key = hashlib.sha1(source.encode('utf-8'))
+    key.update(filename.encode('utf-8'))
+    key.update(kivy.__version__.encode('ascii'))
+    key.update(importlib.util.MAGIC_NUMBER)
+    return key.hexdigest()[:16]
+
+
+def _read_cache(path: str):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        Logger.warning(f'KVCache: ignorando cache inválido {path}: {e}')
+        return None
+
+
+def _write_cache(path: str, parser: Parser):
+    buffer = io.BytesIO()
+    _ParserPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, path)
+
+
+def _remove_stale(cache_path: str, filename: str):
+    """Apaga os caches de versões anteriores do mesmo arquivo KV."""
+    pattern = os.path.join(os.path.dirname(cache_path), glob.escape(os.path.basename(filename)) + '-*.pickle')
+    for stale in glob.glob(pattern):
+        if stale != cache_path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def _register(parser: Parser, filename: str):
+    """Mesmo registro que ``Builder.load_string`` faz para arquivos só de regras."""
+    Builder.rules.extend(parser.rules)
+    Builder._clear_matchcache()
+    
+    for name, cls, template in parser.templates:
+        Builder.templates[name] = (cls, template, filename)
+        Factory.register(name, cls=partial(Builder.template, name), is_template=True, warn=True)
+    
+    for name, baseclasses in parser.dynamic_classes.items():
+        Factory.register(name, baseclasses=baseclasses, filename=filename, warn=True)
+    
+    if parser.templates or parser.dynamic_classes or parser.rules:
+        Builder.files.append(filename)
+
+
+def load_kv(path: str, cache_dir: str = None):
+    """Carrega um arquivo KV só de regras, reaproveitando o parse da execução anterior.
+    
+    O cache é indexado pelo conteúdo do arquivo e pelas versões do Kivy e do
+    Python. Arquivos com widget raiz, ``#:include`` ou qualquer falha no
+    caminho do cache voltam para ``Builder.load_file``.
+    """
+    # Mesmo nome que Builder.load_file registra, para Builder.unload_file achar as regras
+    path = resource_find(path) or path
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    if cache_dir is None or '#:include' in source:
+        return Builder.load_file(path)
+    
+    try:
+        cache_path = os.path.join(cache_dir, f'{os.path.basename(path)}-{_digest(source, path)}.pickle')
+        parser = _read_cache(cache_path)
+        if parser is not None:
+            parser.execute_directives()
+        else:
+            parser = Parser(content=source, filename=path)
+            if parser.root is None:
+                _write_cache(cache_path, parser)
+                _remove_stale(cache_path, path)
+        
+        if parser.root is not None:
+            raise ValueError('arquivo define um widget raiz')
+    except Exception as e:
+        Logger.warning(f'KVCache: {path} carregado sem cache ({e})')
+        return Builder.load_file(path)
+    
+    _register(parser, path)
@@ -0,0 +1,143 @@
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, InstructionGroup, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.properties import BooleanProperty, ColorProperty, NumericProperty, OptionProperty, StringProperty
+from kivy.uix.widget import Widget
+
+
+GLYPHS = '0123456789.x'
+
+_atlas_cache = {}
+
+
+class GlyphAtlas:
+
+    def __init__(self, font_size, bold, outline_width, outline_color):
+        self.outline_width = outline_width
+        outlined = [self._render(glyph, font_size, bold, outline_width, outline_color) for glyph in GLYPHS]
+        filled = [self._render(glyph, font_size, bold, 0, None) for glyph in GLYPHS]
+        
+        rendered = outlined + filled
+        width = sum(texture.width for texture in rendered)
+        self.height = max(texture.height for texture in rendered)
+        self.texture = Texture.create(size=(width, self.height), colorfmt='rgba')
+        self.texture.flip_vertical()
+        
+        regions = []
+        x = 0
+        for texture in rendered:
+            self.texture.blit_buffer(texture.pixels, pos=(x, self.height - texture.height),
+                                     size=texture.size, colorfmt='rgba', bufferfmt='ubyte')
+            regions.append(self.texture.get_region(x, 0, texture.width, texture.height))
+            x += texture.width
+        
+        self.outlined = dict(zip(GLYPHS, regions[:len(GLYPHS)]))
+        self.filled = dict(zip(GLYPHS, regions[len(GLYPHS):]))
+
+    def advance(self, glyph):
+        return self.filled[glyph].width
+
+    def _render(self, glyph, font_size, bold, outline_width, outline_color):
+        options = {'text': glyph, 'font_size': font_size, 'bold': bold, 'color': (1, 1, 1, 1)}
+        if outline_width:
+            options['outline_width'] = outline_width
+            options['outline_color'] = tuple(outline_color[:3])
+        label = CoreLabel(**options)
+        label.refresh()
+        return label.texture
+
+
+def get_glyph_atlas(font_size, bold, outline_width, outline_color):
+    key = (round(font_size, 2), bool(bold), int(outline_width), tuple(outline_color))
+    atlas = _atlas_cache.get(key)
+    if atlas is None:
+        atlas = _atlas_cache[key] = GlyphAtlas(font_size, bold, int(outline_width), outline_color)
+    return atlas
+
+
+class MultiplierLabel(Widget):
+    text = StringProperty('')
+    text_color = ColorProperty([1, 1, 1, 1])
+    font_size = NumericProperty('15sp')
+    bold = BooleanProperty(False)
+    outline_width = NumericProperty(0)
+    outline_color = ColorProperty([0, 0, 0, 1])
+    halign = OptionProperty('center', options=['left', 'center', 'right'])
+
+    def __init__(self, **kwargs):
+        self._atlas = None
+        self._rendered_text = None
+        self._glyphs = []
+        self._outline_rects = []
+        self._fill_rects = []
+        self._trigger_text = Clock.create_trigger(self._update_text)
+        super().__init__(**kwargs)
+        
+        with self.canvas:
+            self._color = Color(rgba=self.text_color)
+            self._outline_group = InstructionGroup()
+            self._fill_group = InstructionGroup()
+        
+        self.bind(text_color=self._update_color)
+        self.bind(font_size=self._invalidate_atlas, bold=self._invalidate_atlas,
+                  outline_width=self._invalidate_atlas, outline_color=self._invalidate_atlas)
+        self.bind(text=self._trigger_text, pos=self._update_layout, size=self._update_layout,
+                  halign=self._update_layout)
+        self._trigger_text()
+
+    def _update_color(self, *args):
+        self._color.rgba = self.text_color
+
+    def _invalidate_atlas(self, *args):
+        self._atlas = None
+        self._rendered_text = None
+        self._trigger_text()
+
+    def _update_text(self, *args):
+        if self.text == self._rendered_text:
+            return
+        
+        if self._atlas is None:
+            self._atlas = get_glyph_atlas(self.font_size, self.bold, self.outline_width, self.outline_color)
+        
+        glyphs = [glyph for glyph in self.text if glyph in self._atlas.filled]
+        if self._rendered_text is None or len(glyphs) != len(self._glyphs):
+            self._outline_group.clear()
+            self._fill_group.clear()
+            self._outline_rects = [Rectangle() for _ in glyphs]
+            self._fill_rects = [Rectangle() for _ in glyphs]
+            for outline_rect, fill_rect in zip(self._outline_rects, self._fill_rects):
+                self._outline_group.add(outline_rect)
+                self._fill_group.add(fill_rect)
+        
+        for outline_rect, fill_rect, glyph in zip(self._outline_rects, self._fill_rects, glyphs):
+            outline_rect.texture = self._atlas.outlined[glyph]
+            outline_rect.size = outline_rect.texture.size
+            fill_rect.texture = self._atlas.filled[glyph]
+            fill_rect.size = fill_rect.texture.size
+        
+        self._glyphs = glyphs
+        self._rendered_text = self.text
+        self._update_layout()
+
+    def _update_layout(self, *args):
+        if self._atlas is None:
+            return
+        
+        atlas = self._atlas
+        outline = atlas.outline_width
+        text_width = sum(atlas.advance(glyph) for glyph in self._glyphs) + 2 * outline
+        
+        if self.halign == 'left':
+            x = self.x
+        elif self.halign == 'right':
+            x = self.right - text_width
+        else:
+            x = self.center_x - text_width / 2
+        y = self.center_y - atlas.height / 2
+        
+        for outline_rect, fill_rect, glyph in zip(self._outline_rects, self._fill_rects, self._glyphs):
+            outline_rect.pos = (x, y)
+            fill_rect.pos = (x + outline, y + outline)
+            x += atlas.advance(glyph)
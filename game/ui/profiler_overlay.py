@@ -0,0 +1,61 @@
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+from game.core.profiler import FrameProfiler
+
+
+PHASE_ORDER = ['frame', 'update_loop', 'game', 'events', 'bets', 'history', 'display', 'ledger']
+KEY_F12 = 293
+
+
+class ProfilerOverlay(Label):
+    """Mostra p50/p99 do frame e de cada fase; F12 grava os histogramas.
+    
+    Os tempos das fases são inclusivos: ``game`` contém ``events``, que por
+    sua vez contém ``bets`` e ``history``.
+    """
+    
+    def __init__(self, profiler: FrameProfiler, dump_path: str = 'profile.json', interval: float = 0.5, **kwargs):
+        kwargs.setdefault('font_name', 'RobotoMono-Regular')
+        kwargs.setdefault('font_size', '13sp')
+        super().__init__(halign='left', valign='top', size_hint=(None, None), **kwargs)
+        self.profiler = profiler
+        self.dump_path = dump_path
+        self._frames = profiler.histogram('frame')
+        
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self._background = Rectangle()
+        self.bind(texture_size=self._on_texture_size)
+        Window.bind(height=lambda *args: self._on_texture_size(self, self.texture_size))
+        
+        Clock.schedule_interval(self._on_frame, 0)
+        Clock.schedule_interval(self._refresh, interval)
+        Window.bind(on_key_down=self._on_key_down)
+    
+    def _on_frame(self, dt):
+        if dt:
+            self._frames.record(dt)
+    
+    def _refresh(self, dt):
+        lines = [f'{"fase":<12}{"p50":>9}{"p99":>9}{"n":>8}']
+        for name, histogram in self.profiler.summary(PHASE_ORDER):
+            lines.append(
+                f'{name:<12}{histogram.quantile(0.5) * 1000:>7.2f}ms'
+                f'{histogram.quantile(0.99) * 1000:>7.2f}ms{histogram.count:>8}'
+            )
+        self.text = '\n'.join(lines)
+    
+    def _on_texture_size(self, instance, size):
+        self.size = (size[0] + dp(16), size[1] + dp(12))
+        self.pos = (dp(10), Window.height - self.height - dp(10))
+        self._background.pos = self.pos
+        self._background.size = self.size
+    
+    def _on_key_down(self, window, key, *args):
+        if key == KEY_F12:
+            self.profiler.dump(self.dump_path)
+            return True
+        return False
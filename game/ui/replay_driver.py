@@ -0,0 +1,38 @@
+from kivy.clock import Clock
+from game.core.events import GameEvent
+from game.games.crash_log import Replayer
+
+
+class ClockReplayDriver:
+
+    def __init__(self, replayer: Replayer):
+        self.replayer = replayer
+        self._event = Clock.create_trigger(self._tick, 0)
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.replayer.game.events.subscribe(self._on_state_change, (GameEvent.STATE_CHANGE,))
+        self._tick(0)
+
+    def stop(self):
+        self._running = False
+        self.replayer.game.events.unsubscribe(self._on_state_change)
+        self._event.cancel()
+
+    def _on_state_change(self, events):
+        # Depois do crash a próxima rodada gravada tem um vencimento novo
+        self._arm(self.replayer.next_due())
+
+    def _tick(self, dt):
+        self._arm(self.replayer.pump())
+
+    def _arm(self, due):
+        if not self._running or due is None:
+            return
+        clock = self.replayer.game.clock
+        self._event.cancel()
+        self._event.timeout = max(0.0, due - clock.now()) / getattr(clock, 'speed', 1.0)
+        self._event()
@@ -1,7 +1,46 @@
+import time
+STARTED = time.perf_counter()
+
+import importlib
+import os
 from kivymd.app import MDApp
+from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.lang import Builder
-from screens.crash_game_screen import CrashGameScreen
+from game.core.game_manager import GameManager
+from game.core.history import HistoryArchive
+from game.core.profiler import profiler
+from game.core.startup import StartupTimer
+from game.ui.kv_cache import load_kv
+
+
+PROFILE_DUMP_PATH = os.environ.get('CASINO_PROFILE_DUMP', 'data/profile.json')
+KV_CACHE_DIR = None if os.environ.get('CASINO_KV_CACHE') == '0' else 'data/kv_cache'
+ROUNDS_LOG_PATH = 'data/rounds.bin'
+HISTORY_DB_PATH = 'data/history.db'
+
+# Telas são importadas só quando selecionadas: (módulo, classe, arquivos KV na ordem de carga)
+SCREENS = {
+    'crash': ('screens.crash_game_screen', 'CrashGameScreen',
+              ['layouts/games/crash_game_area.kv', 'layouts/base_game.kv']),
+}
+DEFAULT_SCREEN = 'crash'
+
+startup = StartupTimer(STARTED)
+startup.mark('imports')
+
+
+def load_screen(name, **kwargs):
+    module_name, class_name, kv_files = SCREENS[name]
+    for path in kv_files:
+        load_kv(path, KV_CACHE_DIR)
+    startup.mark('kv')
+    
+    screen_class = getattr(importlib.import_module(module_name), class_name)
+    startup.mark('screen import')
+    
+    screen = screen_class(name=name, **kwargs)
+    startup.mark('screen build')
+    return screen
 
 
 class CasinoApp(MDApp):
@@ -12,8 +51,80 @@ class CasinoApp(MDApp):
         self.theme_cls.primary_palette = "Green"
         Window.size = (1920, 1080)
         Window.fullscreen = 'auto'
-        Builder.load_file('layouts/base_game.kv')
-        return CrashGameScreen(name='crash')
+        self.recorder = None
+        self.history_store = None
+        self.history_archive = None
+        self.replayer = None
+        replay_path = os.environ.get('CASINO_REPLAY')
+        if replay_path:
+            # Replay não toca no ledger nem no histórico gravado
+            self._prepare_replay(replay_path, float(os.environ.get('CASINO_REPLAY_SPEED', '1')))
+        else:
+            GameManager().open_ledger('data')
+            self.history_archive = HistoryArchive('data/history.bin')
+        if os.environ.get('CASINO_PROFILE'):
+            profiler.enable()
+        startup.mark('app setup')
+        
+        name = os.environ.get('CASINO_GAME', DEFAULT_SCREEN)
+        screen = load_screen(name, history_archive=self.history_archive)
+        if not replay_path and name == 'crash':
+            from game.core.history_store import HistoryStore
+            from game.games.crash_log import RoundRecorder
+            self.recorder = RoundRecorder(ROUNDS_LOG_PATH)
+            self.recorder.attach(screen.game)
+            self.history_store = HistoryStore(HISTORY_DB_PATH)
+            self.history_store.attach(screen.game)
+        return screen
+    
+    def _prepare_replay(self, path, speed):
+        from game.core.clock import ScaledClock
+        from game.games.crash import CrashGame
+        from game.games.crash_log import Replayer, RoundLog
+        
+        manager = GameManager()
+        manager.engine.clock = ScaledClock(speed)
+        game = CrashGame()
+        manager.register_game('crash', game)
+        self.replayer = Replayer(RoundLog(path), game)
+        self.replayer.pump()
+    
+    def on_start(self):
+        if profiler.enabled:
+            from game.ui.profiler_overlay import ProfilerOverlay
+            Window.add_widget(ProfilerOverlay(profiler, dump_path=PROFILE_DUMP_PATH))
+        if self.replayer:
+            from game.ui.replay_driver import ClockReplayDriver
+            self.replay_driver = ClockReplayDriver(self.replayer)
+            self.replay_driver.start()
+        Window.bind(on_flip=self._on_first_frame)
+    
+    def _on_first_frame(self, window):
+        Window.unbind(on_flip=self._on_first_frame)
+        startup.mark('first frame')
+        Clock.schedule_once(self._warm_up)
+    
+    def _warm_up(self, dt):
+        from game.ui.components import run_in_frames
+        run_in_frames(self.root.warm_up(), self._on_warmed_up)
+    
+    def _on_warmed_up(self):
+        startup.mark('warm-up')
+        if os.environ.get('CASINO_STARTUP_TIMING'):
+            print(startup.report())
+            self.stop()
+    
+    def on_stop(self):
+        if profiler.enabled:
+            profiler.dump(PROFILE_DUMP_PATH)
+        if self.recorder:
+            self.recorder.close()
+        if self.history_archive is not None:
+            self.history_archive.close()
+        GameManager().close_ledger()
+        if self.history_store is not None:
+            # Último: repassa uma falha de gravação do histórico depois de fechar o resto
+            self.history_store.close()
 
 
 if __name__ == '__main__':
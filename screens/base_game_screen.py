@@ -2,8 +2,16 @@ from abc import abstractmethod
 from kivy.uix.screenmanager import Screen
 from kivy.properties import NumericProperty, BooleanProperty
 from kivy.clock import Clock
+from game.core.events import GameEvent
 from game.core.game_manager import GameManager
-from game.ui.components import show_snackbar
+from game.core.ledger import LedgerKind
+from game.core.profiler import profiler
+from game.ui.components import prefill_recycleview, show_snackbar
+from game.ui.engine_driver import get_engine_driver
+
+
+FRAME_INTERVAL = 1 / 60
+BETS_WARMUP_ROWS = 12
 
 
 class BaseGameScreen(Screen):
@@ -12,17 +20,32 @@ class BaseGameScreen(Screen):
     auto_cashout_enabled = BooleanProperty(False)
     auto_cashout_value = NumericProperty(2.0)
     
+    PROFILED_PHASES = {
+        'update_loop': 'update_loop',
+        'update_game_display': 'display',
+        'on_bets_events': 'bets',
+        'update_bets_display': 'bets',
+    }
+    
     def __init__(self, game_instance, **kwargs):
         self.update_event = None
+        self._in_update = False
+        self._rendered_version = -1
         self.game_manager = GameManager()
         self.game = game_instance
+        
+        profiler.instrument(self, self.PROFILED_PHASES)
+        profiler.instrument(self.game, {'refresh_display': 'game'})
+        # Avanços de estado, auto cashouts e o crash rodam no tick do engine, fora do update_loop
+        profiler.instrument(self.game_manager.engine, {'tick': 'game'})
+        profiler.instrument(self.game_manager, {'commit': 'ledger'})
         super().__init__(**kwargs)
+        self.game.events.subscribe(self.request_refresh)
+        self.game.events.subscribe(self.on_bets_events, (GameEvent.BETS_CHANGE,))
     
     def on_enter(self):
         if not self.update_event:
-            self.update_event = Clock.schedule_interval(self.update_loop, 1/60)
-            self.update_balance_display()
-            self.update_bets_display()
+            self.start_update_loop()
     
     def on_leave(self):
         if self.update_event:
@@ -32,11 +55,34 @@ class BaseGameScreen(Screen):
     def on_kv_post(self, base_widget):
         super().on_kv_post(base_widget)
         if not self.update_event:
-            self.update_event = Clock.schedule_interval(self.update_loop, 1/60)
-            self.update_balance_display()
-            self.update_bets_display()
+            self.start_update_loop()
             self.update_loop(0)
     
+    def warm_up(self):
+        """Gerador de passos de aquecimento, consumidos um por frame antes da primeira aposta."""
+        if 'bets_list' in self.ids:
+            yield from prefill_recycleview(self.ids.bets_list, BETS_WARMUP_ROWS)
+    
+    def start_update_loop(self):
+        get_engine_driver(self.game_manager.engine).start()
+        self.update_event = Clock.create_trigger(self.update_loop, FRAME_INTERVAL)
+        self.update_balance_display()
+        self.update_bets_display()
+        self.update_event()
+    
+    def request_refresh(self, *args):
+        if self.update_event and not self._in_update:
+            self._schedule_update(0)
+    
+    def _schedule_update(self, delay):
+        self.update_event.cancel()
+        self.update_event.timeout = delay
+        self.update_event()
+    
+    def set_label_text(self, label, text):
+        if label.text != text:
+            label.text = text
+    
     @abstractmethod
     def update_game_display(self):
         pass
@@ -111,18 +157,40 @@ class BaseGameScreen(Screen):
                 return
         
         if self.game.add_bet(self.bet_amount, auto_cashout=auto_cashout_value):
-            self.game_manager.subtract_balance(self.bet_amount)
-            self.update_bets_display()
+            self.game_manager.subtract_balance(self.bet_amount, LedgerKind.BET)
             self.update_balance_display()
             show_snackbar(f'Aposta de R$ {self.bet_amount:.2f} adicionada!')
         else:
             show_snackbar('Não foi possível adicionar a aposta!')
     
+    def add_bets(self, bets):
+        bets = list(bets)
+        total = sum(amount for amount, _ in bets)
+        if not bets or not self.game.can_bet():
+            show_snackbar('Não foi possível adicionar as apostas!')
+            return False
+        
+        if not self.game.valid_bets(bets):
+            show_snackbar('Apostas inválidas!')
+            return False
+        
+        if not self.game_manager.subtract_balance(total, LedgerKind.BET):
+            show_snackbar('Saldo insuficiente!')
+            return False
+        
+        if not self.game.add_bets(bets):
+            self.game_manager.add_balance(total, LedgerKind.REFUND)
+            show_snackbar('Não foi possível adicionar as apostas!')
+            return False
+        
+        self.update_balance_display()
+        show_snackbar(f'{len(bets)} apostas adicionadas (R$ {total:.2f})!')
+        return True
+    
     def cashout_all(self):
         total_winnings = self.game.cashout_all()
         if total_winnings > 0:
-            self.game_manager.add_balance(total_winnings)
-            self.update_bets_display()
+            self.game_manager.add_balance(total_winnings, LedgerKind.CASHOUT)
             self.update_balance_display()
             show_snackbar(f'Retirada total! Ganho: R$ {total_winnings:.2f}')
         else:
@@ -131,43 +199,69 @@ class BaseGameScreen(Screen):
     def clear_bets(self):
         total_returned = self.game.clear_bets()
         if total_returned > 0:
-            self.game_manager.add_balance(total_returned)
-            self.update_bets_display()
+            self.game_manager.add_balance(total_returned, LedgerKind.REFUND)
             self.update_balance_display()
             show_snackbar('Apostas canceladas!')
         else:
             show_snackbar('Não é possível limpar apostas fora da fase de apostas.')
     
     def update_bets_display(self):
-        self.ids.bets_list.clear_widgets()
-        total_bets = self.game.get_active_bets_total()
-        self.ids.total_bets_label.text = f'Apostas: R$ {total_bets:.2f}'
+        self.on_bets_change(None)
+    
+    def on_bets_events(self, events):
+        for _, indices in events:
+            self.on_bets_change(indices)
+    
+    def on_bets_change(self, indices):
+        if 'bets_list' not in self.ids:
+            return
         
-        has_bets = len(self.game.active_bets) > 0
-        self.ids.clear_bets_btn.disabled = not has_bets
+        bets = self.game.active_bets
+        rows = self.ids.bets_list.data
+        if indices is None:
+            self.ids.bets_list.data = [self._bet_row(i, bet) for i, bet in enumerate(bets)]
+        else:
+            new_rows = []
+            for i in indices:
+                row = self._bet_row(i, bets[i])
+                if i < len(rows):
+                    rows[i] = row
+                else:
+                    new_rows.append(row)
+            if new_rows:
+                rows.extend(new_rows)
         
-        for i, bet in enumerate(self.game.active_bets):
-            item_text = f'Aposta {i+1}: R$ {bet.amount:.2f}'
-            if bet.auto_cashout:
-                item_text += f' (Auto: {bet.auto_cashout:.2f}x)'
-            if bet.cashed_out:
-                item_text += f' (Retirado em {bet.cashout_multiplier:.2f}x)'
-            
-            from kivymd.uix.list import OneLineListItem
-            item = OneLineListItem()
-            item.text = item_text
-            item.theme_text_color = 'Primary'
-            self.ids.bets_list.add_widget(item)
+        total_bets = self.game.get_active_bets_total()
+        self.ids.total_bets_label.text = f'Apostas: R$ {total_bets:.2f}'
+        self.ids.clear_bets_btn.disabled = len(bets) == 0
+    
+    def _bet_row(self, index, bet):
+        item_text = f'Aposta {index+1}: R$ {bet.amount:.2f}'
+        if bet.auto_cashout:
+            item_text += f' (Auto: {bet.auto_cashout:.2f}x)'
+        if bet.cashed_out:
+            item_text += f' (Retirado em {bet.cashout_multiplier:.2f}x)'
+        return {'text': item_text, 'theme_text_color': 'Primary'}
     
     def update_balance_display(self):
         self.ids.balance_label.text = f'Saldo: R$ {self.game_manager.get_balance():.2f}'
     
     def update_loop(self, dt):
-        self.game.update(dt)
-        state = self.game.get_game_state()
-        self.update_game_display()
-        self.update_bets_display()
+        self._in_update = True
+        try:
+            self.game.refresh_display()
+            self.game_manager.commit()
+            state = self.game.get_game_state()
+            if state.version != self._rendered_version:
+                self._rendered_version = state.version
+                self.update_game_display()
+                
+                if hasattr(self.ids, 'cashout_btn') and self.ids.cashout_btn.disabled == state.can_cashout:
+                    self.ids.cashout_btn.disabled = not state.can_cashout
+        finally:
+            self._in_update = False
         
-        can_cashout = state.get('can_cashout', False)
-        if hasattr(self.ids, 'cashout_btn'):
-            self.ids.cashout_btn.disabled = not can_cashout
+        if self.update_event:
+            delay = self.game.time_until_next_update()
+            if delay is not None:
+                self._schedule_update(max(FRAME_INTERVAL, delay))
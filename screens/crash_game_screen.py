@@ -1,28 +1,49 @@
 from kivy.animation import Animation
 from kivy.clock import Clock
+from kivy.logger import Logger
+from kivy.metrics import dp
 from screens.base_game_screen import BaseGameScreen
+from game.core.events import GameEvent
 from game.games.crash import CrashGame, GameState
 from game.core.game_manager import GameManager
-from game.ui.components import HistorySquare, WinnerItem
+from game.core.ledger import LedgerKind
+from game.ui.avatars import avatar_provider
+from game.ui.components import WidgetPool, WinnerItem, prefill_recycleview
+from game.ui.multiplier_label import MultiplierLabel  # noqa: F401 - registra o widget para o KV
 import random
 
 
+HISTORY_PAGE_SIZE = 50
+HISTORY_WINDOW_SIZE = 200
+HISTORY_ITEM_WIDTH = 60
+HISTORY_SPACING = 15
+WINNERS_COUNT = 5
+
+
 class CrashGameScreen(BaseGameScreen):
     
-    def __init__(self, **kwargs):
-        crash_game = CrashGame()
+    PROFILED_PHASES = dict(
+        BaseGameScreen.PROFILED_PHASES,
+        on_game_events='events',
+        update_history_display='history',
+        add_history_result='history',
+    )
+    
+    def __init__(self, table='crash', history_archive=None, **kwargs):
         game_manager = GameManager()
-        game_manager.register_game('crash', crash_game)
-        game_manager.set_current_game('crash')
+        crash_game = game_manager.get_game(table)
+        if crash_game is None:
+            crash_game = CrashGame(auto_restart=True)
+            game_manager.register_game(table, crash_game)
+        game_manager.set_current_game(table)
         
         self.game_area = None
+        self.history_archive = history_archive
+        self._history_skip = 0
+        self._history_paging = False
         super().__init__(crash_game, **kwargs)
         
-        self.game.on_round_start = self.on_round_start
-        self.game.on_multiplier_update = self.on_multiplier_update
-        self.game.on_crash = self.on_crash
-        self.game.on_auto_cashout = self.on_auto_cashout
-        self.game.on_state_change = self.on_game_state_change
+        self.game.events.subscribe(self.on_game_events)
         
         self.names = [
             "An***ymous", "Pl***er", "Ga***r", "Lu***y", "Wi***r",
@@ -32,13 +53,31 @@ class CrashGameScreen(BaseGameScreen):
             "An***us", "Us***r", "Pl***r", "Ga***r", "Wi***r"
         ]
         
-        self.start_new_round(0)
+        avatar_provider.seed_from_directory('assets/avatars')
+        self.winner_pool = WidgetPool(WinnerItem, WINNERS_COUNT)
+        self.winner_items = []
+        
+        if self.game.state == GameState.WAITING:
+            self.start_new_round(0)
         Clock.schedule_interval(self.update_winners_display, 3)
     
     def on_kv_post(self, base_widget):
         self.game_area = self.ids.get('game_area')
         super().on_kv_post(base_widget)
+        
+        history_scroll = self._get_game_area_ids().get('history_scroll')
+        if history_scroll:
+            history_scroll.bind(scroll_x=self.on_history_scroll)
+        self.update_history_display()
+        self.update_stats_display()
 
+    def warm_up(self):
+        yield from super().warm_up()
+        history_scroll = self._get_game_area_ids().get('history_scroll')
+        if history_scroll and not history_scroll.data:
+            visible = int(history_scroll.width // dp(HISTORY_ITEM_WIDTH + HISTORY_SPACING)) + 1
+            yield from prefill_recycleview(history_scroll, visible)
+    
     def _get_game_area_ids(self):
         if self.game_area and hasattr(self.game_area, 'ids'):
             return self.game_area.ids
@@ -50,68 +89,140 @@ class CrashGameScreen(BaseGameScreen):
         
         multiplier_display = area_ids.get('multiplier_display')
         if multiplier_display:
-            multiplier_display.text = f"{state['multiplier']:.2f}x"
+            self.set_label_text(multiplier_display, f"{state.multiplier:.2f}x")
         
         round_status = area_ids.get('round_status')
         if round_status:
-            round_status.text = state['round_status']
+            self.set_label_text(round_status, state.round_status)
         
         countdown_label = area_ids.get('countdown')
         if countdown_label:
             countdown_text = ''
-            if state['state'] == GameState.BETTING:
-                countdown = int(state.get('countdown', 0))
+            if state.state == GameState.BETTING:
+                countdown = int(state.countdown)
                 if countdown > 0:
                     countdown_text = f'Iniciando em {countdown}s'
-            countdown_label.text = countdown_text
-        
-        self.update_history_display()
+            self.set_label_text(countdown_label, countdown_text)
     
     def update_history_display(self):
-        area_ids = self._get_game_area_ids()
-        history_container = area_ids.get('history_container')
-        if not history_container:
+        history_scroll = self._get_game_area_ids().get('history_scroll')
+        if not history_scroll:
             return
         
-        if not self.game.last_results:
+        self._history_skip = 0
+        history_scroll.data = [self._history_row(value) for value in self._read_history(HISTORY_PAGE_SIZE)]
+        history_scroll.scroll_x = 0
+    
+    def update_stats_display(self):
+        round_stats = self._get_game_area_ids().get('round_stats')
+        if round_stats:
+            self.set_label_text(round_stats, self.game.stats.summary())
+    
+    def add_history_result(self, crash_point):
+        if self.history_archive is not None:
+            self.history_archive.append(crash_point)
+        
+        history_scroll = self._get_game_area_ids().get('history_scroll')
+        if not history_scroll:
             return
         
-        current_count = len(history_container.children)
-        results_count = len(self.game.last_results)
+        if self._history_skip:
+            self._history_skip += 1
+            return
         
-        if results_count > current_count:
-            new_result = self.game.last_results[-1]
-            history_square = HistorySquare()
-            history_square.text = f'{new_result:.2f}'
-            
-            if new_result >= 10.0:
-                history_square.md_bg_color = [0.2, 0.8, 0.4, 0.8]
-            elif new_result >= 5.0:
-                history_square.md_bg_color = [1.0, 0.6, 0.2, 0.8]
-            elif new_result >= 2.0:
-                history_square.md_bg_color = [0.3, 0.3, 0.3, 0.8]
-            else:
-                history_square.md_bg_color = [0.8, 0.2, 0.2, 0.8]
-            
-            history_container.add_widget(history_square, index=0)
-            
-            history_scroll = area_ids.get('history_scroll')
-            if history_scroll:
-                Clock.schedule_once(lambda dt: setattr(history_scroll, 'scroll_x', 0), 0.1)
+        rows = history_scroll.data
+        rows.insert(0, self._history_row(crash_point))
+        if len(rows) > HISTORY_WINDOW_SIZE:
+            rows.pop()
+        Clock.schedule_once(lambda dt: setattr(history_scroll, 'scroll_x', 0), 0.1)
+    
+    def on_history_scroll(self, history_scroll, scroll_x):
+        if self._history_paging:
+            return
+        
+        rows = history_scroll.data
+        if scroll_x >= 0.95:
+            older = self._read_history(HISTORY_PAGE_SIZE, self._history_skip + len(rows))
+            if not older:
+                return
+            window = rows + [self._history_row(value) for value in older]
+            dropped = max(0, len(window) - HISTORY_WINDOW_SIZE)
+            self._history_skip += dropped
+            self._show_history_window(history_scroll, window[dropped:], scroll_x, -dropped)
+        
+        elif scroll_x <= 0.05 and self._history_skip:
+            count = min(HISTORY_PAGE_SIZE, self._history_skip)
+            newer = self._read_history(count, self._history_skip - count)
+            self._history_skip -= len(newer)
+            window = [self._history_row(value) for value in newer] + rows
+            self._show_history_window(history_scroll, window[:HISTORY_WINDOW_SIZE], scroll_x, len(newer))
+    
+    def _show_history_window(self, history_scroll, window, scroll_x, shifted_items):
+        step = dp(HISTORY_ITEM_WIDTH + HISTORY_SPACING)
+        viewport = history_scroll.width
+        old_range = max(1, self._history_content_width(len(history_scroll.data)) - viewport)
+        new_range = max(1, self._history_content_width(len(window)) - viewport)
+        new_scroll_x = min(1.0, max(0.0, (scroll_x * old_range + shifted_items * step) / new_range))
+        
+        self._history_paging = True
+        history_scroll.data = window
+        
+        def restore(dt):
+            history_scroll.scroll_x = new_scroll_x
+            self._history_paging = False
+        Clock.schedule_once(restore)
+    
+    def _history_content_width(self, count):
+        return dp(2 * HISTORY_SPACING) + count * dp(HISTORY_ITEM_WIDTH + HISTORY_SPACING) - dp(HISTORY_SPACING)
+    
+    def _read_history(self, count, skip=0):
+        if self.history_archive is not None:
+            return self.history_archive.newest(count, skip)
+        return self.game.last_results.newest(count, skip)
+    
+    def _history_row(self, value):
+        if value >= 10.0:
+            color = [0.2, 0.8, 0.4, 0.8]
+        elif value >= 5.0:
+            color = [1.0, 0.6, 0.2, 0.8]
+        elif value >= 2.0:
+            color = [0.3, 0.3, 0.3, 0.8]
+        else:
+            color = [0.8, 0.2, 0.2, 0.8]
+        return {'text': f'{value:.2f}', 'md_bg_color': color}
+    
+    def on_game_events(self, events):
+        auto_cashout_total = 0.0
+        for name, payload in events:
+            if name == GameEvent.ROUND_START:
+                self.on_round_start()
+            elif name == GameEvent.STATE_CHANGE:
+                self.on_game_state_change(*payload)
+            elif name == GameEvent.MULTIPLIER:
+                self.on_multiplier_update(payload)
+            elif name == GameEvent.AUTO_CASHOUT:
+                auto_cashout_total += payload
+            elif name == GameEvent.CRASH:
+                self.on_crash(payload)
+        
+        if auto_cashout_total:
+            self.on_auto_cashout(auto_cashout_total)
     
     def on_round_start(self):
+        self.update_balance_display()
         self.animate_countdown()
     
     def on_multiplier_update(self, multiplier):
         pass
     
     def on_crash(self, crash_point):
+        self.add_history_result(crash_point)
+        self.update_stats_display()
+        Logger.info(f'Crash: {crash_point:.2f}x | {self.game.stats.summary()}')
         self.animate_plane_crash()
-        Clock.schedule_once(self.start_new_round, 2)
     
     def on_auto_cashout(self, amount):
-        self.game_manager.add_balance(amount)
-        self.update_bets_display()
+        self.game_manager.add_balance(amount, LedgerKind.CASHOUT)
         self.update_balance_display()
     
     def on_game_state_change(self, state, countdown):
@@ -137,9 +248,12 @@ class CrashGameScreen(BaseGameScreen):
         if not hasattr(self.ids, 'winners_bar'):
             return
         
-        self.ids.winners_bar.clear_widgets()
+        while len(self.winner_items) < WINNERS_COUNT:
+            winner_widget = self.winner_pool.acquire(size_hint_x=0.2)
+            self.ids.winners_bar.add_widget(winner_widget)
+            self.winner_items.append(winner_widget)
         
-        for i in range(5):
+        for winner_widget in self.winner_items:
             name = random.choice(self.names)
             
             rand = random.random()
@@ -153,9 +267,9 @@ class CrashGameScreen(BaseGameScreen):
                 amount = random.uniform(15000, 100000)
                 multiplier = random.uniform(10.0, 50.0)
             
-            winner_widget = WinnerItem(name=name, amount=amount, multiplier=multiplier)
-            winner_widget.size_hint_x = 0.2
-            self.ids.winners_bar.add_widget(winner_widget)
+            winner_widget.name = name
+            winner_widget.amount = amount
+            winner_widget.multiplier = multiplier
     
     def animate_plane_exit(self):
         multiplier_display = self._get_game_area_ids().get('multiplier_display')